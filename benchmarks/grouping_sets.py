@@ -0,0 +1,100 @@
+"""Compare the sales dashboard's four group-bys against one grouping-sets pass.
+
+Generates random sales-like rows, writes them to Parquet and times:
+
+- ``separate``: one ``group_by`` per dashboard view (month, category,
+  region, payment method), each scanning the file
+- ``grouping_sets``: ``intro_datascience.grouping.grouping_sets``
+
+Run from the repository root::
+
+    uv run python benchmarks/grouping_sets.py --rows 1000000 10000000 100000000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+from intro_datascience import schemas
+from intro_datascience.grouping import Measure, grouping_sets
+
+VIEWS = {
+    "monthly": ["month"],
+    "by_category": ["product_category"],
+    "by_region": ["region"],
+    "by_payment": ["payment_method"],
+}
+MEASURES = [Measure("revenue", "sum", "total_amount"), Measure("transactions", "count")]
+CATEGORIES = ["Electronics", "Clothing", "Home & Garden", "Books", "Sports"]
+CHUNK_ROWS = 10_000_000
+
+
+def write_sales(path: Path, rows: int, seed: int = 0) -> None:
+    """Write ``rows`` random transactions in chunks to keep memory bounded."""
+    rng = np.random.default_rng(seed)
+    chunks = []
+    for start in range(0, rows, CHUNK_ROWS):
+        n = min(CHUNK_ROWS, rows - start)
+        chunk_path = path.with_name(f"{path.stem}-{start}.parquet")
+        pl.DataFrame({
+            "month": rng.integers(1, 13, n, dtype=np.int8),
+            "product_category": _pick(rng, CATEGORIES, n).cast(pl.Categorical),
+            "region": _pick(rng, schemas.REGIONS.categories, n).cast(schemas.REGIONS),
+            "payment_method": _pick(rng, schemas.PAYMENT_METHODS.categories, n).cast(
+                schemas.PAYMENT_METHODS
+            ),
+            "total_amount": rng.uniform(10, 2500, n).round(2),
+        }).write_parquet(chunk_path)
+        chunks.append(chunk_path)
+    pl.scan_parquet(chunks).sink_parquet(path)
+    for chunk_path in chunks:
+        chunk_path.unlink()
+
+
+def _pick(rng: np.random.Generator, values, n: int) -> pl.Series:
+    values = pl.Series(values)
+    return values.gather(rng.integers(0, len(values), n))
+
+
+def separate(sales: pl.LazyFrame) -> dict[str, pl.DataFrame]:
+    aggs = [pl.col("total_amount").sum().alias("revenue"), pl.len().alias("transactions")]
+    return {name: sales.group_by(keys).agg(aggs).collect() for name, keys in VIEWS.items()}
+
+
+def combined(sales: pl.LazyFrame) -> dict[str, pl.DataFrame]:
+    return grouping_sets(sales, VIEWS, MEASURES)
+
+
+def best_of(fn, sales: pl.LazyFrame, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(sales)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000, 100_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'separate (s)':>13} {'grouping_sets (s)':>18} {'speed-up':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = Path(tmp) / f"sales-{rows}.parquet"
+            write_sales(path, rows)
+            sales = pl.scan_parquet(path)
+            t_separate = best_of(separate, sales, args.repeat)
+            t_combined = best_of(combined, sales, args.repeat)
+            print(f"{rows:>12,} {t_separate:>13.3f} {t_combined:>18.3f} {t_separate / t_combined:>8.2f}x")
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
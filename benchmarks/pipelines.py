@@ -0,0 +1,279 @@
+"""Benchmark the notebook pipelines on synthetic data at a chosen scale.
+
+Each case repeats an operation from ``02_data_wrangling.py`` or a figure
+from ``03_plotting.py`` on data made by ``intro_datascience.synthetic``.
+Scale factor 1 is 100k students, 1M sales and 100 weather stations for a
+year; other factors scale all three. Generated data is kept in
+``benchmarks/data/sf<N>`` and reused by later runs.
+
+Every case runs in a fresh process so its peak RSS is its own. The best of
+``--repeat`` runs is recorded with the peak RSS and input rows per second,
+and written to ``benchmarks/results/``. With ``--baseline`` the run is
+compared to a saved result and the script exits with status 1 when a case is
+more than ``--threshold`` slower::
+
+    uv run python benchmarks/pipelines.py --scale 1 --save-baseline
+    uv run python benchmarks/pipelines.py --scale 1 --baseline benchmarks/baseline-sf1.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+
+import polars as pl
+
+from intro_datascience import charts, cleaning, datasets, rollups, synthetic
+
+BENCH_DIR = Path(__file__).resolve().parent
+STUDENTS_PER_SF = 100_000
+SALES_PER_SF = 1_000_000
+STATIONS_PER_SF = 100
+
+CASES: dict[str, Callable[[Path], int]] = {}
+
+
+def case(fn: Callable[[Path], int]) -> Callable[[Path], int]:
+    """Register a benchmark. It gets the data folder and returns its input rows."""
+    CASES[fn.__name__] = fn
+    return fn
+
+
+@case
+def load_students(data: Path) -> int:
+    return datasets.students(data).collect().height
+
+
+@case
+def load_sales(data: Path) -> int:
+    return datasets.sales(data).collect().height
+
+
+@case
+def filter_students(data: Path) -> int:
+    students = datasets.students(data).collect()
+    students.filter((pl.col("attendance_rate") >= 90) & (pl.col("test_score") > 80))
+    return students.height
+
+
+@case
+def with_columns_letter_grade(data: Path) -> int:
+    students = datasets.students(data).collect()
+    students.with_columns(
+        pl.when(pl.col("test_score") >= 90).then(pl.lit("A"))
+        .when(pl.col("test_score") >= 80).then(pl.lit("B"))
+        .when(pl.col("test_score") >= 70).then(pl.lit("C"))
+        .when(pl.col("test_score") >= 60).then(pl.lit("D"))
+        .otherwise(pl.lit("F"))
+        .alias("letter_grade")
+    )
+    return students.height
+
+
+@case
+def group_by_category(data: Path) -> int:
+    sales = datasets.sales(data).collect()
+    sales.group_by("product_category").agg(
+        pl.len().alias("transaction_count"),
+        pl.col("total_amount").sum().alias("total_revenue"),
+        pl.col("total_amount").mean().alias("avg_transaction"),
+        pl.col("quantity").sum().alias("total_quantity"),
+    ).sort("total_revenue", descending=True)
+    return sales.height
+
+
+@case
+def join_grade_info(data: Path) -> int:
+    students = datasets.students(data).collect()
+    grade_info = pl.DataFrame({
+        "grade_level": [8, 9, 10, 11, 12],
+        "grade_name": ["8th Grade", "9th Grade", "10th Grade", "11th Grade", "12th Grade"],
+        "school_level": ["Middle", "High", "High", "High", "High"],
+    }).with_columns(pl.col("grade_level").cast(pl.UInt8))
+    students.join(grade_info, on="grade_level", how="left")
+    return students.height
+
+
+@case
+def sales_clean(data: Path) -> int:
+    sales = datasets.sales(data)
+    cleaning.clean_sales(sales).collect(engine="streaming")
+    return _height(sales)
+
+
+@case
+def figure_category_bar(data: Path) -> int:
+    import plotly.express as px
+
+    rollups.clear(data)  # time the first run, not a saved result
+    category_sales = rollups.rollup("category_sales", data)
+    px.bar(category_sales, x="product_category", y="total_revenue", color="total_revenue")
+    return _height(datasets.sales(data))
+
+
+@case
+def figure_score_scatter(data: Path) -> int:
+    students = datasets.students(data)
+    charts.scatter(
+        students, x="attendance_rate", y="test_score",
+        trendline="ols", color="subject", size="age", hover_data=["name"],
+    )
+    return _height(students)
+
+
+@case
+def figure_score_histogram(data: Path) -> int:
+    students = datasets.students(data)
+    charts.histogram(students, "test_score", bins=10)
+    return _height(students)
+
+
+@case
+def figure_weather_monthly(data: Path) -> int:
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    weather = datasets.weather(data)
+    monthly = datasets.with_calendar(weather).group_by("month").agg(
+        pl.col("temperature_high").mean().alias("avg_high"),
+        pl.col("precipitation").sum().alias("total_precip"),
+    ).sort("month").collect()
+    fig = make_subplots(rows=2, cols=1)
+    fig.add_trace(go.Bar(x=monthly["month"], y=monthly["avg_high"]), row=1, col=1)
+    fig.add_trace(go.Bar(x=monthly["month"], y=monthly["total_precip"]), row=2, col=1)
+    return _height(weather)
+
+
+@case
+def figure_sales_dashboard(data: Path) -> int:
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    rollups.clear(data)
+    dashboard = rollups.rollup_all(
+        ["monthly_sales", "category_sales", "region_sales", "payment_sales"], data
+    )
+    monthly = dashboard["monthly_sales"]
+    fig = make_subplots(
+        rows=2, cols=2,
+        specs=[[{"type": "scatter"}, {"type": "bar"}], [{"type": "bar"}, {"type": "pie"}]],
+    )
+    month_start = monthly.select(pl.date("year", "month", 1).alias("month_start"))["month_start"]
+    fig.add_trace(go.Scatter(x=month_start, y=monthly["total_revenue"]), row=1, col=1)
+    by_category = dashboard["category_sales"]
+    fig.add_trace(
+        go.Bar(x=by_category["product_category"], y=by_category["total_revenue"]), row=1, col=2
+    )
+    by_region = dashboard["region_sales"]
+    fig.add_trace(go.Bar(x=by_region["region"], y=by_region["total_revenue"]), row=2, col=1)
+    payment = dashboard["payment_sales"]
+    fig.add_trace(
+        go.Pie(labels=payment["payment_method"], values=payment["transaction_count"]), row=2, col=2
+    )
+    return _height(datasets.sales(data))
+
+
+def _height(frame: pl.LazyFrame) -> int:
+    return frame.select(pl.len()).collect().item()
+
+
+def ensure_data(scale: float) -> Path:
+    """Generate the synthetic data for ``scale`` unless it already exists."""
+    data = BENCH_DIR / "data" / f"sf{scale:g}"
+    if not (data / "sales").is_dir():
+        print(f"Generating scale factor {scale:g} data in {data} ...", flush=True)
+        synthetic.generate_students(data, int(STUDENTS_PER_SF * scale))
+        synthetic.generate_sales(data, int(SALES_PER_SF * scale))
+        synthetic.generate_weather(data, max(1, int(STATIONS_PER_SF * scale)))
+    return data
+
+
+def run_case(name: str, data: Path, repeat: int) -> dict:
+    """Run one case ``repeat`` times; called in a fresh worker process."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = CASES[name](data)
+        times.append(time.perf_counter() - start)
+    seconds = min(times)
+    return {
+        "seconds": seconds,
+        "peak_rss_mb": _peak_rss_mb(),
+        "rows": rows,
+        "rows_per_sec": rows / seconds if seconds else None,
+    }
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Names of cases more than ``threshold`` slower than in ``baseline``."""
+    regressions = []
+    for name, result in results["cases"].items():
+        before = baseline["cases"].get(name)
+        if before and result["seconds"] > before["seconds"] * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--baseline", type=Path, help="result JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    data = ensure_data(args.scale)
+    results = {
+        "scale": args.scale,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "polars": pl.__version__,
+        "platform": platform.platform(),
+        "cases": {},
+    }
+    context = multiprocessing.get_context("spawn")
+    print(f"{'case':<28} {'seconds':>9} {'peak RSS MB':>12} {'rows/sec':>14}")
+    for name in args.cases:
+        with context.Pool(1) as pool:
+            result = pool.apply(run_case, (name, data, args.repeat))
+        results["cases"][name] = result
+        rss = "n/a" if result["peak_rss_mb"] is None else f"{result['peak_rss_mb']:.0f}"
+        print(f"{name:<28} {result['seconds']:>9.3f} {rss:>12} {result['rows_per_sec']:>14,.0f}")
+
+    out_dir = BENCH_DIR / "results"
+    out_dir.mkdir(exist_ok=True)
+    out_path = out_dir / f"{datetime.now():%Y%m%d-%H%M%S}-sf{args.scale:g}.json"
+    out_path.write_text(json.dumps(results, indent=2))
+    print(f"\nSaved {out_path}")
+    if args.save_baseline:
+        baseline_path = BENCH_DIR / f"baseline-sf{args.scale:g}.json"
+        baseline_path.write_text(json.dumps(results, indent=2))
+        print(f"Saved baseline {baseline_path}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        for name in regressions:
+            print(f"REGRESSION: {name} is more than {args.threshold:.0%} slower than the baseline")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -38,13 +38,15 @@ def _(mo):
 @app.cell
 def _():
     import polars as pl
+    from intro_datascience import datasets
 
-    # Load CSV file
-    students = pl.read_csv("../data/raw/students.csv")
+    # Load CSV file: datasets.students() reads data/raw/students.csv with
+    # the right column types, and .collect() loads it into a DataFrame
+    students = datasets.students().collect()
 
     print("✓ Loaded students.csv")
     print(f"Shape: {students.shape[0]} rows × {students.shape[1]} columns")
-    return pl, students
+    return datasets, pl, students
 
 
 @app.cell
@@ -63,9 +65,9 @@ def _(mo):
 
 
 @app.cell
-def _(pl):
+def _(datasets):
     # Load JSON file
-    sales = pl.read_json("../data/raw/sales.json")
+    sales = datasets.sales().collect()
 
     print("✓ Loaded sales.json")
     print(f"Shape: {sales.shape[0]} rows × {sales.shape[1]} columns")
@@ -78,6 +80,34 @@ def _(sales):
     return
 
 
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(r"""
+    ### Loading Lazily
+
+    Above, `.collect()` loaded every column straight away. On their own, the
+    `datasets` helpers only *scan* the file and return a `LazyFrame`: nothing is
+    read until you call `.collect()`, and Polars then only reads the columns and
+    rows it needs.
+    """)
+    return
+
+
+@app.cell
+def _(datasets, pl):
+    # Only the "region" and "total_amount" columns are read from disk
+    region_revenue = (
+        datasets.sales()
+        .group_by("region")
+        .agg(pl.col("total_amount").sum().alias("revenue"))
+        .sort("revenue", descending=True)
+        .collect()
+    )
+
+    region_revenue
+    return
+
+
 @app.cell(hide_code=True)
 def _(mo):
     mo.md(r"""
@@ -347,13 +377,13 @@ def _(mo):
 
 @app.cell
 def _(pl, sales):
-    # Parse dates and extract components
+    # datasets.sales() already parsed "date" into a Date (with pl.read_json
+    # it would still be text: pl.col("date").str.strptime(pl.Date, "%Y-%m-%d"))
+    # Extract its components
     sales_with_date = sales.with_columns([
-        pl.col("date").str.strptime(pl.Date, "%Y-%m-%d").alias("date_parsed")
-    ]).with_columns([
-        pl.col("date_parsed").dt.year().alias("year"),
-        pl.col("date_parsed").dt.month().alias("month"),
-        pl.col("date_parsed").dt.day().alias("day")
+        pl.col("date").dt.year().alias("year"),
+        pl.col("date").dt.month().alias("month"),
+        pl.col("date").dt.day().alias("day")
     ])
 
     sales_with_date.select(["date", "year", "month", "day"]).head()
@@ -372,6 +402,31 @@ def _(pl, sales_with_date):
     return
 
 
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(r"""
+    With years of sales, a question about one month still reads every
+    transaction. `partitions.sales` keeps the cleaned sales in one folder per
+    month (`year=2024/month=03/...`) and only opens the months in the dates
+    you ask for:
+    """)
+    return
+
+
+@app.cell
+def _(pl):
+    from datetime import date
+
+    from intro_datascience import partitions
+
+    march = partitions.sales(start=date(2024, 3, 1), end=date(2024, 3, 31))
+    march.select(
+        pl.col("total_amount").sum().alias("monthly_revenue"),
+        pl.len().alias("transaction_count")
+    ).collect()
+    return
+
+
 @app.cell(hide_code=True)
 def _(mo):
     mo.md(r"""
@@ -452,13 +507,14 @@ def _(mo):
 
 
 @app.cell
-def _(pl, sales):
+def _(pl, sales, sales_with_date):
     # Clean and standardize the sales data
     sales_clean = (
-        sales
+        sales_with_date
         # Standardize category names (fix capitalization)
         .with_columns([
             pl.col("product_category")
+            .cast(pl.String)  # loaded as a Categorical; text methods need String
             .str.to_titlecase()
             .alias("product_category")
         ])
@@ -469,10 +525,9 @@ def _(pl, sales):
         )
         # Add derived columns
         .with_columns([
-            pl.col("date").str.strptime(pl.Date, "%Y-%m-%d").alias("date_parsed"),
             (pl.col("total_amount") / pl.col("quantity")).round(2).alias("calculated_unit_price")
         ])
-        .sort("date_parsed")
+        .sort("date")
     )
 
     print(f"Original: {sales.shape[0]} rows")
@@ -484,6 +539,29 @@ def _(pl, sales):
     return
 
 
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(r"""
+    ### Cleaning Data Larger Than Memory
+
+    The same steps are packaged in `cleaning.clean_sales`, which builds a lazy
+    query instead of running each step straight away. On Polars' streaming
+    engine the query reads its input in batches, so it also works on sales
+    histories that do not fit in memory; `cleaning.write_clean_sales` writes
+    the result to Parquet with `sink_parquet`.
+    """)
+    return
+
+
+@app.cell
+def _():
+    from intro_datascience import cleaning, datasets as _datasets
+
+    clean_query = cleaning.clean_sales(_datasets.sales())
+    clean_query.collect(engine="streaming").head()
+    return
+
+
 @app.cell(hide_code=True)
 def _(mo):
     mo.md(r"""
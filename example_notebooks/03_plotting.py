@@ -38,20 +38,20 @@ def _(mo):
 @app.cell
 def _():
     import polars as pl
-    import plotly.express as px
-    import plotly.graph_objects as go
+    from intro_datascience import charts, datasets, figures, rollups, windows
+    from intro_datascience.imports import lazy_import
 
-    # Load datasets
-    try:
-        weather = pl.read_parquet("../data/raw/weather.parquet")
-    except:
-        weather = pl.read_csv("../data/raw/weather.csv")
+    # Plotly loads when the first figure is drawn, so this cell runs quickly
+    px = lazy_import("plotly.express")
+    go = lazy_import("plotly.graph_objects")
 
-    sales = pl.read_json("../data/raw/sales.json")
-    students = pl.read_csv("../data/raw/students.csv")
+    # Scan datasets lazily - each chart only reads the columns it uses
+    weather, weather_report = datasets.open_weather()
+    students = datasets.students()
 
-    print("✓ Data loaded successfully!")
-    return go, pl, px, sales, students, weather
+    print(f"✓ Weather: {weather_report}")
+    print("✓ Data ready!")
+    return charts, datasets, figures, go, pl, px, rollups, students, weather, windows
 
 
 @app.cell(hide_code=True)
@@ -63,32 +63,65 @@ def _(mo):
 
 
 @app.cell
-def _(px, weather):
+def _(mo, pl, weather):
+    # Pick dates to zoom into - the line charts below re-read just that window
+    first_day, last_day = weather.select(
+        pl.col("date").min().alias("first"), pl.col("date").max().alias("last")
+    ).collect().row(0)
+    window = mo.ui.date_range(start=first_day, stop=last_day, label="Dates")
+    window
+    return (window,)
+
+
+@app.cell
+def _(charts, weather, window):
     # Simple line chart
-    fig1 = px.line(
-        weather.head(30),  # First 30 days
-        x="date",
-        y="temperature_high",
-        title="Daily High Temperature (First 30 Days)"
+    # charts.timeseries draws the whole history, cut down to at most 1,000 points
+    fig1 = charts.timeseries(
+        weather,
+        "date",
+        "temperature_high",
+        start=window.value[0],
+        end=window.value[1],
+        title="Daily High Temperature"
     )
     fig1
     return
 
 
 @app.cell
-def _(px, weather):
+def _(charts, weather, window):
     # Multiple lines on one chart
-    fig2 = px.line(
-        weather.head(90),
-        x="date",
-        y=["temperature_high", "temperature_low"],
-        title="Temperature Range (First 90 Days)",
-        labels={"value": "Temperature (°C)", "variable": "Type"}
+    fig2 = charts.timeseries(
+        weather,
+        "date",
+        ["temperature_high", "temperature_low"],
+        start=window.value[0],
+        end=window.value[1],
+        title="Temperature Range",
+        labels={"value": "Temperature (°C)"}
     )
     fig2
     return
 
 
+@app.cell
+def _(charts, weather, window, windows):
+    # Smooth out day-to-day noise: windows.rolling adds 7- and 30-day rolling means
+    smoothed = windows.rolling(weather)
+    smoothed_fig = charts.timeseries(
+        smoothed,
+        "date",
+        ["temperature_high", "temperature_high_mean_7d", "temperature_high_mean_30d"],
+        start=window.value[0],
+        end=window.value[1],
+        title="Daily High Temperature with Rolling Means",
+        labels={"value": "Temperature (°C)"}
+    )
+    smoothed_fig
+    return
+
+
 @app.cell(hide_code=True)
 def _(mo):
     mo.md(r"""
@@ -102,7 +135,7 @@ def _(pl, px, students):
     # Count by category
     by_subject = students.group_by("subject").agg([
         pl.len().alias("count")
-    ])
+    ]).collect()
 
     fig3 = px.bar(
         by_subject,
@@ -116,19 +149,19 @@ def _(pl, px, students):
 
 
 @app.cell
-def _(pl, px, sales):
-    # Sales by category
-    category_sales = sales.group_by("product_category").agg([
-        pl.col("total_amount").sum().alias("revenue")
-    ]).sort("revenue", descending=True)
+def _(figures, px, rollups):
+    # Sales by category (computed once and shared with other notebooks)
+    category_sales = rollups.rollup("category_sales")
 
-    fig4 = px.bar(
+    # figures.cached reuses the saved figure while the data and arguments are unchanged
+    fig4 = figures.cached(
+        px.bar,
         category_sales,
         x="product_category",
-        y="revenue",
+        y="total_revenue",
         title="Total Revenue by Product Category",
-        labels={"product_category": "Category", "revenue": "Revenue ($)"},
-        color="revenue",
+        labels={"product_category": "Category", "total_revenue": "Revenue ($)"},
+        color="total_revenue",
         color_continuous_scale="Blues"
     )
     fig4
@@ -144,15 +177,17 @@ def _(mo):
 
 
 @app.cell
-def _(px, students):
+def _(charts, figures, students):
     # Relationship between two variables
-    fig5 = px.scatter(
+    # charts.scatter switches to WebGL, then to a density heatmap, as rows grow
+    fig5 = figures.cached(
+        charts.scatter,
         students,
         x="attendance_rate",
         y="test_score",
         title="Test Score vs Attendance Rate",
         labels={"attendance_rate": "Attendance (%)", "test_score": "Test Score"},
-        trendline="ols",  # Add trend line
+        trendline="ols",  # Add trend lines, fitted per subject in Polars
         color="subject",
         size="age",
         hover_data=["name"]
@@ -162,9 +197,10 @@ def _(px, students):
 
 
 @app.cell
-def _(px, weather):
+def _(charts, figures, weather):
     # Weather relationships
-    fig6 = px.scatter(
+    fig6 = figures.cached(
+        charts.scatter,
         weather,
         x="humidity",
         y="precipitation",
@@ -186,30 +222,33 @@ def _(mo):
 
 
 @app.cell
-def _(px, students):
+def _(charts, figures, students):
     # Distribution of a single variable
-    fig7 = px.histogram(
+    # charts.histogram counts the bins in Polars, so only 10 bars reach the browser
+    fig7 = figures.cached(
+        charts.histogram,
         students,
-        x="test_score",
+        "test_score",
+        bins=10,
         title="Distribution of Test Scores",
         labels={"test_score": "Test Score"},
-        nbins=10,
-        color_discrete_sequence=["steelblue"]
+        color="steelblue"
     )
     fig7
     return
 
 
 @app.cell
-def _(px, weather):
+def _(charts, figures, weather):
     # Compare distributions
-    fig8 = px.histogram(
+    fig8 = figures.cached(
+        charts.histogram,
         weather,
-        x="temperature_high",
+        "temperature_high",
+        bins=20,
         title="Distribution of High Temperatures",
         labels={"temperature_high": "Temperature (°C)"},
-        nbins=20,
-        marginal="box"  # Add box plot on top
+        box=True  # Add box plot on top
     )
     fig8
     return
@@ -228,7 +267,7 @@ def _(pl, px, students):
     # Create data
     by_grade = students.group_by("grade_level").agg([
         pl.col("test_score").mean().alias("avg_score")
-    ]).sort("grade_level")
+    ]).sort("grade_level").collect()
 
     # Customized bar chart
     fig9 = px.bar(
@@ -266,18 +305,14 @@ def _(mo):
 
 
 @app.cell
-def _(go, pl, weather):
+def _(datasets, go, pl, weather):
     from plotly.subplots import make_subplots
 
-    # Prepare monthly data
-    weather_monthly = weather.with_columns([
-        pl.col("date").str.strptime(pl.Date, "%Y-%m-%d").alias("date_parsed")
-    ]).with_columns([
-        pl.col("date_parsed").dt.month().alias("month")
-    ]).group_by("month").agg([
+    # Prepare monthly data (dates are already parsed when loading)
+    weather_monthly = datasets.with_calendar(weather).group_by("month").agg([
         pl.col("temperature_high").mean().alias("avg_high"),
         pl.col("precipitation").sum().alias("total_precip")
-    ]).sort("month")
+    ]).sort("month").collect()
 
     # Create subplots
     fig10 = make_subplots(
@@ -315,15 +350,13 @@ def _(mo):
 
 
 @app.cell
-def _(pl, px, sales):
+def _(px, rollups):
     # Sales by region
-    region_sales = sales.group_by("region").agg([
-        pl.col("total_amount").sum().alias("revenue")
-    ])
+    region_sales = rollups.rollup("region_sales")
 
     fig11 = px.pie(
         region_sales,
-        values="revenue",
+        values="total_revenue",
         names="region",
         title="Sales Distribution by Region",
         hole=0.3  # Make it a donut chart
@@ -346,23 +379,15 @@ def _(mo):
 
 
 @app.cell
-def _(go, make_subplots, pl, sales):
-    # Prepare data
-    monthly = sales.with_columns([
-        pl.col("date").str.strptime(pl.Date, "%Y-%m-%d").alias("date_parsed")
-    ]).with_columns([
-        pl.col("date_parsed").dt.month().alias("month")
-    ]).group_by("month").agg([
-        pl.col("total_amount").sum().alias("revenue")
-    ]).sort("month")
-
-    by_category = sales.group_by("product_category").agg([
-        pl.col("total_amount").sum().alias("revenue")
-    ]).sort("revenue", descending=True)
-
-    by_region = sales.group_by("region").agg([
-        pl.col("total_amount").sum().alias("revenue")
-    ])
+def _(go, make_subplots, pl, rollups):
+    # Prepare data: all four summaries come from one pass over the sales
+    dashboard = rollups.rollup_all(
+        ["monthly_sales", "category_sales", "region_sales", "payment_sales"]
+    )
+    monthly = dashboard["monthly_sales"]
+    by_category = dashboard["category_sales"]
+    by_region = dashboard["region_sales"]
+    payment = dashboard["payment_sales"]
 
     # Create dashboard
     fig12 = make_subplots(
@@ -375,26 +400,28 @@ def _(go, make_subplots, pl, sales):
 
     # Monthly trend
     fig12.add_trace(
-        go.Scatter(x=monthly["month"], y=monthly["revenue"], mode='lines+markers', name="Monthly"),
+        go.Scatter(
+            x=monthly.select(pl.date("year", "month", 1).alias("month_start"))["month_start"],
+            y=monthly["total_revenue"], mode='lines+markers', name="Monthly",
+        ),
         row=1, col=1
     )
 
     # By category
     fig12.add_trace(
-        go.Bar(x=by_category["product_category"], y=by_category["revenue"], name="Category"),
+        go.Bar(x=by_category["product_category"], y=by_category["total_revenue"], name="Category"),
         row=1, col=2
     )
 
     # By region
     fig12.add_trace(
-        go.Bar(x=by_region["region"], y=by_region["revenue"], name="Region"),
+        go.Bar(x=by_region["region"], y=by_region["total_revenue"], name="Region"),
         row=2, col=1
     )
 
     # Payment methods
-    payment = sales.group_by("payment_method").agg([pl.len().alias("count")])
     fig12.add_trace(
-        go.Pie(labels=payment["payment_method"], values=payment["count"], name="Payment"),
+        go.Pie(labels=payment["payment_method"], values=payment["transaction_count"], name="Payment"),
         row=2, col=2
     )
 
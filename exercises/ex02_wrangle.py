@@ -30,12 +30,9 @@ def _(mo):
 @app.cell
 def _():
     import polars as pl
-    import plotly.express as px
-    import plotly.graph_objects as go
-    from datetime import datetime
     import marimo as mo
 
-    return (mo,)
+    return mo, pl
 
 
 @app.cell(hide_code=True)
@@ -207,6 +204,8 @@ def _():
 def _():
     # TODO: Calculate total sales by month
     # Show which month had the highest revenue
+    # (Bonus: intro_datascience.partitions.sales() has the cleaned sales with
+    # year and month columns, stored one folder per month)
 
     monthly_sales = None
     return
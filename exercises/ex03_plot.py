@@ -87,6 +87,8 @@ def _():
     # attendance_rate (x-axis) and test_score (y-axis)
     # - Color points by grade_level
     # - Add a trendline (trendline="ols")
+    #   Tip: charts.scatter from intro_datascience takes the same arguments
+    #   and fits the trendlines in Polars instead of statsmodels
     # - Add appropriate title and labels
 
     ex_fig3 = None
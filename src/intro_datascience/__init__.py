@@ -0,0 +1 @@
+"""Shared helpers for the IntroDataScience notebooks and exercises."""
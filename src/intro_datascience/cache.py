@@ -0,0 +1,189 @@
+"""Columnar cache of the raw datasets in ``data/processed``.
+
+Text formats like JSON and CSV have to be parsed in full every time they are
+loaded. The first load converts the source to Parquet; later loads scan the
+Parquet copy until the source file changes.
+
+A small ``_cache_manifest.json`` next to the cached files records each
+source's size, modification time and SHA-256. A matching size and mtime is
+trusted as-is; otherwise the source is re-hashed, and the copy is only
+rebuilt when the content really changed. Callers can pass an extra ``key``
+(such as a schema fingerprint) so the copy is also rebuilt when the way the
+source is read changes.
+
+``copy_is_current`` applies the same check to copies made outside the cache,
+such as a ``weather.arrow`` saved next to ``weather.csv``.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Callable
+from pathlib import Path
+
+import polars as pl
+
+MANIFEST_NAME = "_cache_manifest.json"
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Hash a file in chunks so large exports never sit in memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stat_fingerprint(paths: list[Path]) -> str:
+    """A cheap version string for a set of files, from their names, sizes and mtimes."""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        stat = path.stat()
+        digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def cached_parquet(
+    source: Path,
+    read: Callable[[Path], pl.DataFrame | pl.LazyFrame],
+    cache_dir: Path,
+    key: str = "",
+) -> Path:
+    """Return the path of an up-to-date Parquet copy of ``source``.
+
+    ``read`` loads the source. A ``LazyFrame`` is streamed into the cache with
+    ``sink_parquet``; a ``DataFrame`` is written directly.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(cache_dir)
+    stat = source.stat()
+    entry = manifest.get(source.name)
+
+    if (
+        entry is not None
+        and entry.get("key", "") == key
+        and (cache_dir / entry["cache_file"]).exists()
+    ):
+        if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return cache_dir / entry["cache_file"]
+        sha256 = file_sha256(source)
+        if entry["sha256"] == sha256:
+            # Touched but unchanged: remember the new mtime, keep the copy
+            entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            _write_manifest(cache_dir, manifest)
+            return cache_dir / entry["cache_file"]
+    else:
+        sha256 = file_sha256(source)
+
+    version = hashlib.sha256(f"{sha256}:{key}".encode()).hexdigest()
+    cache_file = f"{source.stem}-{version[:12]}.parquet"
+    _write_parquet(read(source), cache_dir / cache_file)
+
+    if entry is not None and entry["cache_file"] != cache_file:
+        (cache_dir / entry["cache_file"]).unlink(missing_ok=True)
+    manifest[source.name] = {
+        "cache_file": cache_file,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256,
+        "key": key,
+    }
+    _write_manifest(cache_dir, manifest)
+    return cache_dir / cache_file
+
+
+def copy_is_current(copy: Path, source: Path, cache_dir: Path) -> bool:
+    """Whether ``copy``, converted from ``source`` outside the cache, still matches it.
+
+    The first time a copy is seen (or after it is rewritten) it is trusted
+    if it is newer than the source, and the source's fingerprint is recorded
+    in the manifest. From then on the copy goes stale only when the source's
+    content changes: a source that was just touched, or copied with new
+    timestamps, is re-hashed and found unchanged.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(cache_dir)
+    name = f"derived/{copy.name}"
+    copy_stat, stat = copy.stat(), source.stat()
+    copy_version = [copy_stat.st_size, copy_stat.st_mtime_ns]
+    entry = manifest.get(name)
+
+    if entry is None or entry["source"] != source.name or entry["copy"] != copy_version:
+        if copy_stat.st_mtime_ns < stat.st_mtime_ns:
+            return False
+        sha256 = file_sha256(source)
+    elif (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+        return True
+    else:
+        sha256 = file_sha256(source)
+        if sha256 != entry["sha256"]:
+            return False
+
+    manifest[name] = {
+        "source": source.name,
+        "copy": copy_version,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256,
+    }
+    _write_manifest(cache_dir, manifest)
+    return True
+
+
+def clear(cache_dir: Path) -> None:
+    """Delete every cached file listed in the manifest.
+
+    Copies checked with ``copy_is_current`` live outside the cache and are kept.
+    """
+    for entry in _read_manifest(cache_dir).values():
+        if "cache_file" in entry:
+            (cache_dir / entry["cache_file"]).unlink(missing_ok=True)
+    (cache_dir / MANIFEST_NAME).unlink(missing_ok=True)
+
+
+def write_atomic(path: Path, write: Callable[[Path], object]) -> None:
+    """Create or replace ``path`` with ``write(tmp_path)``.
+
+    The file is written next to the target and renamed into place, so
+    readers never see half a file::
+
+        cache.write_atomic(path, frame.write_parquet)
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def replace_directory(tmp_directory: Path, directory: Path) -> None:
+    """Move the completely written ``tmp_directory`` into place as ``directory``.
+
+    An earlier ``directory`` is moved aside to ``<name>.old`` first and then
+    deleted, along with any ``.old`` folder an interrupted run left behind.
+    """
+    old_directory = directory.with_name(directory.name + ".old")
+    shutil.rmtree(old_directory, ignore_errors=True)
+    if directory.exists():
+        os.replace(directory, old_directory)
+    os.replace(tmp_directory, directory)
+    shutil.rmtree(old_directory, ignore_errors=True)
+
+
+def _write_parquet(frame: pl.DataFrame | pl.LazyFrame, path: Path) -> None:
+    if isinstance(frame, pl.LazyFrame):
+        write_atomic(path, frame.sink_parquet)
+    else:
+        write_atomic(path, frame.write_parquet)
+
+
+def _read_manifest(cache_dir: Path) -> dict[str, dict]:
+    path = cache_dir / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def _write_manifest(cache_dir: Path, manifest: dict[str, dict]) -> None:
+    write_atomic(cache_dir / MANIFEST_NAME, lambda p: p.write_text(json.dumps(manifest, indent=2)))
@@ -0,0 +1,662 @@
+"""Plotly figures that stay responsive however many rows the data has.
+
+``px.scatter`` sends every point to the browser, which stalls somewhere
+above 100k points even once it switches from SVG to WebGL. ``scatter`` picks
+how to draw from the row count:
+
+- up to ``WEBGL_THRESHOLD`` rows: an ordinary SVG scatter
+- up to ``DENSITY_THRESHOLD`` rows: the same scatter drawn with WebGL, from
+  the same row count at which ``px.scatter`` would switch
+- above that: a density heatmap binned in Polars, so the browser receives
+  a fixed ``bins`` x ``bins`` grid rather than the rows themselves
+
+``histogram`` likewise computes bin counts and the box plot's quartiles,
+whiskers and outliers in Polars and draws them with ``go.Bar`` and
+``go.Box``, so the figure holds one value per bin instead of every raw value.
+
+``scatter(..., trendline="ols")`` fits its trendlines here too: ``ols_fits``
+computes slope, intercept, R² and what the confidence band needs for every
+colour group in one Polars ``group_by``, where Plotly would convert the data
+to pandas and fit a statsmodels model per group.
+
+``timeseries`` draws long series at a constant size: Polars keeps the
+minimum and maximum of each of a few thousand time buckets, and
+Largest-Triangle-Three-Buckets (LTTB) picks ``points`` of those that keep
+the line's shape. Passing a narrower ``start``/``end`` re-fetches that
+window at full detail, which is how a zoom control should call it::
+
+    from intro_datascience import charts
+
+    charts.scatter(students, x="attendance_rate", y="test_score", color="subject")
+    charts.histogram(weather, "temperature_high", bins=20, box=True)
+    charts.timeseries(weather, "date", ["temperature_high", "temperature_low"])
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from statistics import NormalDist
+
+import numpy as np
+import polars as pl
+
+from intro_datascience.imports import lazy_import
+
+# Plotly is imported when the first figure is drawn, not with this module
+px = lazy_import("plotly.express")
+go = lazy_import("plotly.graph_objects")
+subplots = lazy_import("plotly.subplots")
+
+logger = logging.getLogger(__name__)
+
+# Plotly's own switch to WebGL in render_mode="auto"
+WEBGL_THRESHOLD = 1_000
+DENSITY_THRESHOLD = 200_000
+DENSITY_BINS = 100
+TRENDLINE_POINTS = 50
+TIMESERIES_POINTS = 1_000
+# Whiskers end at the last value within this many IQRs of the box (Tukey)
+WHISKER_IQR = 1.5
+# Outliers drawn beside a box; beyond this many distinct values, a spread of them
+BOX_OUTLIERS = 2_000
+
+
+def scatter(
+    frame: pl.DataFrame | pl.LazyFrame,
+    x: str,
+    y: str,
+    *,
+    color: str | None = None,
+    size: str | None = None,
+    hover_data: list[str] | None = None,
+    webgl_threshold: int = WEBGL_THRESHOLD,
+    density_threshold: int = DENSITY_THRESHOLD,
+    bins: int = DENSITY_BINS,
+    **kwargs,
+) -> go.Figure:
+    """A scatter of ``y`` against ``x`` drawn to suit the number of rows.
+
+    Other keyword arguments (``title``, ``labels``, ...) go to ``px.scatter``,
+    or to the figure layout when a density heatmap is drawn instead.
+    ``trendline="ols"`` adds a least-squares line with a 95% confidence band
+    for each group of a categorical ``color`` (see ``add_trendlines``).
+    """
+    trendline = kwargs.pop("trendline", None)
+    if trendline not in (None, "ols"):
+        raise ValueError(f"Unsupported trendline {trendline!r}, only 'ols' is available")
+    lazy = frame.lazy()
+    rows = lazy.select(pl.len()).collect().item()
+    if rows > density_threshold:
+        fig = _density_figure(lazy, x, y, color, bins, rows, **kwargs)
+    else:
+        fig = _point_scatter(lazy, x, y, color, size, hover_data, rows > webgl_threshold, **kwargs)
+    if trendline:
+        categorical = color and not lazy.collect_schema()[color].is_numeric()
+        add_trendlines(fig, lazy, x, y, by=color if categorical else None)
+    return fig
+
+
+def _point_scatter(
+    lazy: pl.LazyFrame,
+    x: str,
+    y: str,
+    color: str | None,
+    size: str | None,
+    hover_data: list[str] | None,
+    webgl: bool,
+    **kwargs,
+) -> go.Figure:
+    columns = list(dict.fromkeys(c for c in [x, y, color, size, *(hover_data or [])] if c))
+    return px.scatter(
+        lazy.select(columns).collect(),
+        x=x,
+        y=y,
+        color=color,
+        size=size,
+        hover_data=hover_data,
+        render_mode="webgl" if webgl else "svg",
+        **kwargs,
+    )
+
+
+def density_grid(
+    frame: pl.DataFrame | pl.LazyFrame,
+    x: str,
+    y: str,
+    bins: int = DENSITY_BINS,
+    value: str | None = None,
+) -> pl.DataFrame:
+    """Count rows in a ``bins`` x ``bins`` grid over the range of ``x`` and ``y``.
+
+    Returns one row per non-empty cell with the cell centre (``x``, ``y``),
+    ``count`` and, if ``value`` is given, the mean of that column as ``value``.
+    """
+    lazy = frame.lazy().select(x, y, *([value] if value else [])).drop_nulls([x, y])
+    bounds = lazy.select(
+        pl.col(x).min().alias("x_min"), pl.col(x).max().alias("x_max"),
+        pl.col(y).min().alias("y_min"), pl.col(y).max().alias("y_max"),
+    ).collect().row(0, named=True)
+    x_step = _step(bounds["x_min"], bounds["x_max"], bins)
+    y_step = _step(bounds["y_min"], bounds["y_max"], bins)
+
+    def cell(column: str, low: float, step: float) -> pl.Expr:
+        return ((pl.col(column) - low) / step).floor().clip(0, bins - 1).cast(pl.UInt32)
+
+    return (
+        lazy.group_by(
+            cell(x, bounds["x_min"], x_step).alias("x_cell"),
+            cell(y, bounds["y_min"], y_step).alias("y_cell"),
+        )
+        .agg(pl.len().alias("count"), *([pl.col(value).mean().alias("value")] if value else []))
+        .with_columns(
+            (bounds["x_min"] + (pl.col("x_cell") + 0.5) * x_step).alias(x),
+            (bounds["y_min"] + (pl.col("y_cell") + 0.5) * y_step).alias(y),
+        )
+        .sort("x_cell", "y_cell")
+        .collect(engine="streaming")
+    )
+
+
+def summary(frame: pl.DataFrame | pl.LazyFrame, column: str) -> dict[str, float | int | None]:
+    """Row count, mean and five-number summary (min, q1, median, q3, max) of ``column``."""
+    col = pl.col(column)
+    return frame.lazy().select(
+        col.count().alias("count"),
+        col.mean().alias("mean"),
+        col.min().alias("min"),
+        col.quantile(0.25, "linear").alias("q1"),
+        col.median().alias("median"),
+        col.quantile(0.75, "linear").alias("q3"),
+        col.max().alias("max"),
+    ).collect().row(0, named=True)
+
+
+def box_stats(
+    frame: pl.DataFrame | pl.LazyFrame, column: str, stats: dict | None = None
+) -> tuple[dict[str, float | None], pl.Series]:
+    """Tukey whiskers of ``column`` and the outliers beyond them.
+
+    Whiskers reach the most extreme values within ``WHISKER_IQR`` times the
+    interquartile range of the quartiles, as in ``px.box``. Returns
+    ``lowerfence`` and ``upperfence``, and the distinct values outside them,
+    sorted. ``stats`` is the column's ``summary``, if already computed.
+    """
+    stats = stats or summary(frame, column)
+    col = pl.col(column)
+    if stats["q1"] is None:
+        return {"lowerfence": None, "upperfence": None}, pl.Series(column, [], pl.Float64)
+    reach = WHISKER_IQR * (stats["q3"] - stats["q1"])
+    inside = col.is_between(stats["q1"] - reach, stats["q3"] + reach)
+    found = frame.lazy().select(
+        col.filter(inside).min().alias("lowerfence"),
+        col.filter(inside).max().alias("upperfence"),
+        col.filter(~inside).unique().sort().implode().alias("outliers"),
+    ).collect()
+    outliers = found["outliers"].explode().drop_nulls().alias(column)
+    if outliers.len() > BOX_OUTLIERS:
+        # Keep the most extreme values and an even spread of the rest
+        step = math.ceil(outliers.len() / BOX_OUTLIERS)
+        outliers = pl.concat([outliers.gather_every(step), outliers.tail(1)]).unique(
+            maintain_order=True
+        )
+    return found.select("lowerfence", "upperfence").row(0, named=True), outliers
+
+
+def histogram_bins(
+    frame: pl.DataFrame | pl.LazyFrame,
+    column: str,
+    bins: int = 10,
+    low: float | None = None,
+    high: float | None = None,
+) -> pl.DataFrame:
+    """Counts of ``column`` in ``bins`` equal-width bins from ``low`` to ``high``.
+
+    The range defaults to the column's minimum and maximum; the maximum falls
+    in the last bin. Returns ``bin_start``, ``bin_end`` and ``count`` for every
+    bin, including empty ones. Nulls are not counted.
+    """
+    lazy = frame.lazy().select(column).drop_nulls()
+    if low is None or high is None:
+        bounds = lazy.select(pl.col(column).min().alias("low"), pl.col(column).max().alias("high"))
+        found = bounds.collect().row(0, named=True)
+        low = found["low"] if low is None else low
+        high = found["high"] if high is None else high
+    low = 0.0 if low is None else low
+    step = _step(low, high, bins)
+
+    counts = (
+        lazy.group_by(
+            ((pl.col(column) - low) / step).floor().clip(0, bins - 1).cast(pl.UInt32).alias("bin")
+        )
+        .agg(pl.len().alias("count"))
+        .collect(engine="streaming")
+    )
+    return (
+        pl.DataFrame({"bin": pl.arange(0, bins, dtype=pl.UInt32, eager=True)})
+        .join(counts, on="bin", how="left")
+        .select(
+            (low + pl.col("bin") * step).alias("bin_start"),
+            (low + (pl.col("bin") + 1) * step).alias("bin_end"),
+            pl.col("count").fill_null(0).cast(pl.UInt32),
+        )
+    )
+
+
+def histogram(
+    frame: pl.DataFrame | pl.LazyFrame,
+    x: str,
+    bins: int = 10,
+    *,
+    box: bool = False,
+    title: str | None = None,
+    labels: dict[str, str] | None = None,
+    color: str = "steelblue",
+) -> go.Figure:
+    """A histogram of ``x`` from counts computed in Polars.
+
+    With ``box=True`` a box plot sits above the bars, like
+    ``px.histogram(..., marginal="box")``: quartiles, Tukey whiskers and the
+    outliers beyond them, all computed in Polars (see ``box_stats``).
+    """
+    lazy = frame.lazy().select(x)
+    stats = summary(lazy, x)
+    counts = histogram_bins(lazy, x, bins, stats["min"], stats["max"])
+    label = (labels or {}).get(x, x)
+
+    bars = go.Bar(
+        x=(counts["bin_start"] + counts["bin_end"]) / 2,
+        y=counts["count"],
+        width=counts["bin_end"] - counts["bin_start"],
+        customdata=counts.select("bin_start", "bin_end").to_numpy(),
+        marker_color=color,
+        hovertemplate=f"{label}=%{{customdata[0]:.4g}} - %{{customdata[1]:.4g}}<br>"
+        "count=%{y}<extra></extra>",
+        name=label,
+    )
+    if not box:
+        fig = go.Figure(bars)
+    else:
+        fig = subplots.make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.2, 0.8],
+                                     vertical_spacing=0.03)
+        whiskers, outliers = box_stats(lazy, x, stats)
+        for trace in _box(stats | whiskers, outliers, label, color):
+            fig.add_trace(trace, row=1, col=1)
+        fig.add_trace(bars, row=2, col=1)
+        fig.update_yaxes(showticklabels=False, row=1, col=1)
+    fig.update_layout(title=title, bargap=0, showlegend=False)
+    fig.update_xaxes(title_text=label, row=2 if box else None, col=1 if box else None)
+    fig.update_yaxes(title_text="count", row=2 if box else None, col=1 if box else None)
+    return fig
+
+
+def ols_fits(
+    frame: pl.DataFrame | pl.LazyFrame, x: str, y: str, by: str | None = None
+) -> pl.DataFrame:
+    """Least-squares fit of ``y`` on ``x`` for each group of ``by``, in one pass.
+
+    Returns ``n``, ``slope``, ``intercept`` and ``r2`` per group, plus the
+    mean and spread of ``x`` and the residual standard error that
+    ``trendline_band`` uses. Rows with a null ``x`` or ``y`` are left out.
+    """
+    keys = [by] if by else []
+    dx = pl.col(x) - pl.col(x).mean()
+    dy = pl.col(y) - pl.col(y).mean()
+    lazy = frame.lazy().select(*keys, x, y).drop_nulls([x, y])
+    sums = [
+        pl.len().alias("n"),
+        pl.col(x).mean().alias("x_mean"),
+        pl.col(y).mean().alias("y_mean"),
+        pl.col(x).min().alias("x_min"),
+        pl.col(x).max().alias("x_max"),
+        (dx * dx).sum().alias("sxx"),
+        (dx * dy).sum().alias("sxy"),
+        (dy * dy).sum().alias("syy"),
+    ]
+    grouped = lazy.group_by(keys).agg(sums) if keys else lazy.select(sums)
+    slope = pl.col("sxy") / pl.col("sxx")
+    sse = (pl.col("syy") - slope * pl.col("sxy")).clip(lower_bound=0)
+    return (
+        grouped.with_columns(slope.alias("slope"))
+        .with_columns(
+            (pl.col("y_mean") - pl.col("slope") * pl.col("x_mean")).alias("intercept"),
+            (1 - sse / pl.col("syy")).alias("r2"),
+            pl.when(pl.col("n") > 2).then((sse / (pl.col("n") - 2)).sqrt()).alias("residual_std"),
+        )
+        .select(*keys, "n", "slope", "intercept", "r2", "x_mean", "sxx", "residual_std",
+                "x_min", "x_max")
+        .sort(keys or "n")
+        .collect()
+    )
+
+
+def trendline_band(
+    fits: pl.DataFrame, by: str | None = None, level: float = 0.95, points: int = TRENDLINE_POINTS
+) -> pl.DataFrame:
+    """Fitted values and a confidence band for the mean at ``points`` x values per fit.
+
+    ``fits`` comes from ``ols_fits``. Returns ``x``, ``fitted``, ``lower`` and
+    ``upper`` (plus ``by``) spanning each group's range of ``x``. The band is
+    null for groups with fewer than three rows.
+    """
+    keys = [by] if by else []
+    t = pl.Series([_t_quantile((1 + level) / 2, n - 2) if n > 2 else None for n in fits["n"]])
+    steps = pl.int_range(0, points, eager=True) / max(points - 1, 1)
+    return (
+        fits.with_columns(t=t)
+        .join(pl.DataFrame({"step": steps}), how="cross", maintain_order="left_right")
+        .with_columns((pl.col("x_min") + pl.col("step") * (pl.col("x_max") - pl.col("x_min"))).alias("x"))
+        .with_columns(
+            (pl.col("intercept") + pl.col("slope") * pl.col("x")).alias("fitted"),
+            (
+                pl.col("t") * pl.col("residual_std")
+                * (1 / pl.col("n") + (pl.col("x") - pl.col("x_mean")) ** 2 / pl.col("sxx")).sqrt()
+            ).alias("margin"),
+        )
+        .select(
+            *keys, "x", "fitted",
+            (pl.col("fitted") - pl.col("margin")).alias("lower"),
+            (pl.col("fitted") + pl.col("margin")).alias("upper"),
+        )
+    )
+
+
+def add_trendlines(
+    fig: go.Figure,
+    frame: pl.DataFrame | pl.LazyFrame,
+    x: str,
+    y: str,
+    by: str | None = None,
+    level: float = 0.95,
+    points: int = TRENDLINE_POINTS,
+) -> go.Figure:
+    """Draw an OLS line and confidence band per group of ``by`` onto ``fig``.
+
+    Lines take the colour of the figure's trace named after their group, as
+    drawn by ``px.scatter(..., color=by)``.
+    """
+    fits = ols_fits(frame, x, y, by)
+    bands = trendline_band(fits, by, level, points)
+    trace_colors = {
+        trace.name: trace.marker.color
+        for trace in fig.data
+        if trace.name and getattr(trace, "marker", None) is not None
+        and isinstance(trace.marker.color, str)
+    }
+    palette = px.colors.qualitative.Plotly
+    for i, fit in enumerate(fits.iter_rows(named=True)):
+        name = str(fit[by]) if by else "OLS"
+        band = bands.filter(pl.col(by) == fit[by]) if by else bands
+        color = trace_colors.get(name, palette[i % len(palette)])
+        fig.add_trace(go.Scatter(
+            x=pl.concat([band["x"], band["x"].reverse()]),
+            y=pl.concat([band["upper"], band["lower"].reverse()]),
+            fill="toself",
+            fillcolor=color,
+            opacity=0.15,
+            line_width=0,
+            hoverinfo="skip",
+            showlegend=False,
+            legendgroup=name,
+        ))
+        fig.add_trace(go.Scatter(
+            x=band["x"],
+            y=band["fitted"],
+            mode="lines",
+            line_color=color,
+            name=f"{name} trend" if by else name,
+            legendgroup=name,
+            showlegend=False,
+            hovertemplate=(
+                f"<b>OLS trendline {name if by else ''}</b><br>"
+                f"{y} = {fit['slope']:.4g} * {x} + {fit['intercept']:.4g}<br>"
+                f"R<sup>2</sup>={fit['r2']:.4f}<br>n={fit['n']}<extra></extra>"
+            ),
+        ))
+    return fig
+
+
+def decimate(
+    frame: pl.DataFrame | pl.LazyFrame,
+    x: str,
+    y: str,
+    points: int = TIMESERIES_POINTS,
+    *,
+    by: str | None = None,
+    method: str = "lttb",
+    start=None,
+    end=None,
+) -> pl.DataFrame:
+    """At most ``points`` rows of ``x`` and ``y`` per group of ``by`` that keep the line's shape.
+
+    Rows are limited to ``start <= x <= end`` first, so the window is read
+    at full detail. ``method="minmax"`` keeps the lowest and highest point in
+    each of ``points / 2`` equal-width ``x`` buckets. ``method="lttb"`` keeps
+    the minimum and maximum of ``2 * points`` buckets, then chooses
+    ``points`` of those with LTTB (the MinMaxLTTB scheme), so Polars does the
+    work that grows with the data. LTTB always keeps each group's first and
+    last rows and its lowest and highest ``y``.
+    """
+    if method not in ("lttb", "minmax"):
+        raise ValueError(f"Unknown decimation method {method!r}, use 'lttb' or 'minmax'")
+    keys = [by] if by else []
+    lazy = frame.lazy().select(*keys, x, y).drop_nulls([x, y])
+    if start is not None:
+        lazy = lazy.filter(pl.col(x) >= start)
+    if end is not None:
+        lazy = lazy.filter(pl.col(x) <= end)
+
+    position = pl.col(x).to_physical().cast(pl.Float64)
+    bounds = lazy.select(
+        position.min().alias("low"), position.max().alias("high"),
+        (pl.len().over(keys).max() if keys else pl.len()).alias("rows"),
+    ).collect().row(0, named=True)
+    if bounds["rows"] <= points:
+        return lazy.sort(*keys, x).collect()
+
+    buckets = points // 2 if method == "minmax" else 2 * points
+    step = _step(bounds["low"], bounds["high"], buckets)
+    bucket = ((position - bounds["low"]) / step).floor().clip(0, buckets - 1).alias("bucket")
+    extremes = (
+        lazy.group_by(*keys, bucket)
+        .agg(
+            pl.col(x).get(pl.col(y).arg_min()).alias("x_min"),
+            pl.col(y).min().alias("y_min"),
+            pl.col(x).get(pl.col(y).arg_max()).alias("x_max"),
+            pl.col(y).max().alias("y_max"),
+        )
+    )
+    parts = [
+        extremes.select(*keys, pl.col("x_min").alias(x), pl.col("y_min").alias(y)),
+        extremes.select(*keys, pl.col("x_max").alias(x), pl.col("y_max").alias(y)),
+    ]
+    if method == "lttb":
+        # LTTB keeps its first and last candidates, so make those the line's ends
+        first, last = pl.col(x).min(), pl.col(x).max()
+        if keys:
+            first, last = first.over(keys), last.over(keys)
+        parts.append(lazy.filter((pl.col(x) == first) | (pl.col(x) == last)))
+    candidates = (
+        pl.concat(parts)
+        .unique(maintain_order=False)
+        .sort(*keys, x)
+        .collect(engine="streaming")
+    )
+    if method == "minmax":
+        return candidates
+
+    groups = candidates.partition_by(keys, maintain_order=True) if keys else [candidates]
+    return pl.concat([
+        group[_lttb(group[x].to_physical().cast(pl.Float64).to_numpy(), group[y].to_numpy(), points)]
+        for group in groups
+    ])
+
+
+def timeseries(
+    frame: pl.DataFrame | pl.LazyFrame,
+    x: str,
+    y: str | list[str],
+    *,
+    by: str | None = None,
+    start=None,
+    end=None,
+    points: int = TIMESERIES_POINTS,
+    method: str = "lttb",
+    title: str | None = None,
+    labels: dict[str, str] | None = None,
+) -> go.Figure:
+    """A line per ``y`` column (and group of ``by``), each cut down to ``points`` points.
+
+    Only the ``start`` to ``end`` window is read. Pass the range of a zoom
+    control, such as ``mo.ui.date_range``, to redraw at finer detail.
+    """
+    labels = labels or {}
+    columns = [y] if isinstance(y, str) else y
+    fig = go.Figure()
+    for column in columns:
+        line = decimate(frame, x, column, points, by=by, method=method, start=start, end=end)
+        groups = line.partition_by(by, maintain_order=True, as_dict=True) if by else {(): line}
+        for key, group in groups.items():
+            name = labels.get(column, column)
+            if by:
+                name = f"{name} {key[0]}" if len(columns) > 1 else str(key[0])
+            fig.add_trace(go.Scattergl(x=group[x], y=group[column], mode="lines", name=name))
+    fig.update_layout(
+        title=title,
+        xaxis_title=labels.get(x, x),
+        yaxis_title=labels.get("value", columns[0] if len(columns) == 1 else "value"),
+        showlegend=len(fig.data) > 1,
+    )
+    return fig
+
+
+def _lttb(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """Indices of ``points`` rows chosen by Largest-Triangle-Three-Buckets.
+
+    The first and last rows are kept. The rest are split into ``points - 2``
+    buckets, and from each the row forming the largest triangle with the row
+    kept from the previous bucket and the mean of the next bucket is kept.
+    The rows with the lowest and highest ``y`` are always kept as well.
+    """
+    size = len(x)
+    if points >= size or points < 3:
+        return np.arange(size)
+    edges = np.linspace(1, size - 1, points - 1).astype(int)
+    keep = np.empty(points, dtype=int)
+    keep[0], keep[-1] = 0, size - 1
+    previous = 0
+    for i in range(points - 2):
+        low, high = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x, next_y = x[high:edges[i + 2]].mean(), y[high:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs(
+            (x[previous] - next_x) * (y[low:high] - y[previous])
+            - (x[previous] - x[low:high]) * (next_y - y[previous])
+        )
+        previous = low + int(area.argmax())
+        keep[i + 1] = previous
+    # The triangles can step over a spike, so the lowest and highest rows are
+    # kept too, each in place of the nearest row not already fixed
+    fixed = [0, points - 1]
+    for extreme in dict.fromkeys((int(y.argmin()), int(y.argmax()))):
+        if extreme in keep:
+            fixed.append(int(np.flatnonzero(keep == extreme)[0]))
+            continue
+        distance = np.abs(keep - extreme).astype(float)
+        distance[fixed] = np.inf
+        if np.isfinite(distance).any():
+            fixed.append(int(distance.argmin()))
+            keep[fixed[-1]] = extreme
+    return np.sort(keep)
+
+
+def _t_quantile(p: float, df: int) -> float:
+    """Quantile of Student's t distribution, without importing scipy.
+
+    Exact for one and two degrees of freedom; otherwise the Cornish-Fisher
+    expansion around the normal quantile (Abramowitz & Stegun 26.7.5), which
+    is within 0.2% from three degrees of freedom on for 95% bands.
+    """
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    z = NormalDist().inv_cdf(p)
+    return (
+        z
+        + (z**3 + z) / (4 * df)
+        + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * df**2)
+        + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * df**3)
+        + (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / (92160 * df**4)
+    )
+
+
+def _box(stats: dict, outliers: pl.Series, label: str, color: str) -> list:
+    """A horizontal box drawn from summary statistics, and its outlier points.
+
+    A box given its statistics cannot also draw points, so the outliers are
+    a scatter on the same row.
+    """
+    box = go.Box(
+        q1=[stats["q1"]],
+        median=[stats["median"]],
+        q3=[stats["q3"]],
+        lowerfence=[stats["lowerfence"]],
+        upperfence=[stats["upperfence"]],
+        mean=[stats["mean"]],
+        y=[label],
+        orientation="h",
+        marker_color=color,
+        name=label,
+    )
+    points = go.Scatter(
+        x=outliers.to_numpy(),
+        y=[label] * outliers.len(),
+        mode="markers",
+        marker={"color": color, "size": 4},
+        name=label,
+        hovertemplate=f"{label}=%{{x}}<extra>outlier</extra>",
+    )
+    return [box, points]
+
+
+def _density_figure(
+    lazy: pl.LazyFrame, x: str, y: str, color: str | None, bins: int, rows: int, **kwargs
+) -> go.Figure:
+    # A numeric colour becomes the mean per cell; a categorical one can't be shown
+    value = color if color and lazy.collect_schema()[color].is_numeric() else None
+    if color and value is None:
+        logger.info("Density view of %s rows ignores the categorical colour %r", rows, color)
+    grid = density_grid(lazy, x, y, bins, value)
+
+    labels = kwargs.pop("labels", {}) or {}
+    z_column = "value" if value else "count"
+    z_label = labels.get(value, value) if value else "rows"
+    fig = go.Figure(
+        go.Heatmap(
+            x=grid[x],
+            y=grid[y],
+            z=grid[z_column],
+            customdata=grid["count"],
+            colorscale=kwargs.pop("color_continuous_scale", None) or "Viridis",
+            colorbar={"title": z_label},
+            hovertemplate=(
+                f"{labels.get(x, x)}=%{{x}}<br>{labels.get(y, y)}=%{{y}}<br>"
+                f"{z_label}=%{{z}}<br>rows=%{{customdata}}<extra></extra>"
+            ),
+        )
+    )
+    fig.update_layout(
+        xaxis_title=labels.get(x, x),
+        yaxis_title=labels.get(y, y),
+        **{k: v for k, v in kwargs.items() if k in ("title", "height", "width", "template")},
+    )
+    return fig
+
+
+def _step(low: float | None, high: float | None, bins: int) -> float:
+    if low is None or high is None or high <= low:
+        return 1.0
+    return (high - low) / bins
@@ -0,0 +1,130 @@
+"""The sales cleaning steps from ``02_data_wrangling.py`` as a lazy pipeline.
+
+``clean_sales`` adds the cleaning steps to a ``LazyFrame``, so the same steps
+work on the bundled file, on a folder of parts and on data larger than
+memory. Only the distinct product categories are read up front (see
+``normalize_categories``), on the streaming engine; the rows themselves are
+not read until the result is collected or sunk. ``write_clean_sales`` runs them on Polars'
+streaming engine, which reads the input in batches, and writes the result
+with ``sink_parquet``::
+
+    from intro_datascience import cleaning, datasets
+
+    clean = cleaning.clean_sales(datasets.sales()).collect()
+    cleaning.write_clean_sales(raw_dir=Path("data/synthetic"))
+
+Sorting by date needs every row before the first one can be written; the
+streaming engine spills to disk when sorting data larger than memory. Pass
+``sort=False`` where the order does not matter.
+
+``normalize_categories`` cleans up the spelling of category columns (case,
+spaces, aliases). A column like ``product_category`` has millions of rows
+but only a handful of distinct values, so the cleanup runs once per
+distinct value and the rows are then remapped to an ``Enum``, instead of
+running string functions on every row::
+
+    cleaning.normalize_categories(
+        sales,
+        {"product_category": None, "region": schemas.REGIONS},
+        aliases={"home and garden": "Home & Garden"},
+    )
+"""
+
+import re
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+import polars as pl
+
+from intro_datascience import cache, datasets, schemas
+
+
+def clean_sales(sales: pl.DataFrame | pl.LazyFrame, sort: bool = True) -> pl.LazyFrame:
+    """The cleaning steps of ``02_data_wrangling.py`` as a lazy query.
+
+    - product categories in title case ("electronics" becomes "Electronics"),
+      worked out once per distinct category by ``normalize_categories``
+    - transactions with a quantity or total of zero or less dropped
+    - ``date`` parsed when it is still text
+    - ``calculated_unit_price`` added
+    - rows sorted by date, unless ``sort=False``
+    """
+    sales = sales.lazy()
+    if sales.collect_schema()["date"] == pl.String:
+        sales = sales.with_columns(pl.col("date").str.to_date(schemas.DATE_FORMAT))
+    cleaned = (
+        normalize_categories(sales, {"product_category": None})
+        .filter((pl.col("quantity") > 0) & (pl.col("total_amount") > 0))
+        .with_columns(
+            (pl.col("total_amount") / pl.col("quantity")).round(2).alias("calculated_unit_price")
+        )
+    )
+    return cleaned.sort("date") if sort else cleaned
+
+
+def clean_sales_path(raw_dir: Path | None = None) -> Path:
+    return datasets.processed_dir(raw_dir) / "sales_clean.parquet"
+
+
+def write_clean_sales(
+    raw_dir: Path | None = None, path: Path | None = None, sort: bool = True
+) -> Path:
+    """Clean the sales in ``raw_dir`` on the streaming engine and write them to ``path``.
+
+    ``path`` defaults to ``sales_clean.parquet`` in the processed folder for
+    ``raw_dir``. The file is replaced only once it is completely written.
+    """
+    path = path or clean_sales_path(raw_dir)
+    cleaned = clean_sales(datasets.sales(raw_dir), sort=sort)
+    cache.write_atomic(path, lambda p: cleaned.sink_parquet(p, engine="streaming"))
+    return path
+
+
+def normalize_categories(
+    frame: pl.DataFrame | pl.LazyFrame,
+    columns: Mapping[str, pl.Enum | Iterable[str] | None],
+    aliases: Mapping[str, str] | None = None,
+) -> pl.LazyFrame:
+    """Respell the values of category ``columns`` and store them as ``pl.Enum``.
+
+    ``columns`` maps each column to its canonical values (an ``Enum`` from
+    ``schemas`` such as ``REGIONS`` or ``WEATHER_CONDITIONS``, or a list), or to ``None`` to title-case whatever
+    values occur. A value is matched ignoring case and repeated or surrounding
+    spaces; ``aliases`` (keys matched the same way) map other spellings, such
+    as ``{"home and garden": "Home & Garden"}``.
+
+    The distinct values of all ``columns`` are read in one small query, and
+    each is cleaned up once. ``ValueError`` is raised for a value that is
+    neither canonical nor an alias when canonical values are given.
+    """
+    lazy = frame.lazy()
+    folded_aliases = {_fold(k): v for k, v in (aliases or {}).items()}
+    # Streaming, so only the distinct values are held in memory, not the columns
+    distinct = lazy.select(
+        pl.col(column).unique().cast(pl.String).implode() for column in columns
+    ).collect(engine="streaming").row(0, named=True)
+
+    remaps = []
+    for column, canonical in columns.items():
+        values = [v for v in distinct[column] if v is not None]
+        if canonical is None:
+            mapping = {v: folded_aliases.get(_fold(v), _collapse(v).title()) for v in values}
+            dtype = pl.Enum(sorted(set(mapping.values())))
+        else:
+            known = list(canonical.categories if isinstance(canonical, pl.Enum) else canonical)
+            by_fold = {_fold(k): k for k in known} | folded_aliases
+            unknown = [v for v in values if _fold(v) not in by_fold]
+            if unknown:
+                raise ValueError(f"Unexpected values in {column!r}: {unknown}")
+            mapping = {v: by_fold[_fold(v)] for v in values}
+            dtype = pl.Enum(known)
+        remaps.append(pl.col(column).replace_strict(mapping, return_dtype=dtype))
+    return lazy.with_columns(remaps)
+
+
+def _collapse(value: str) -> str:
+    return re.sub(r"\s+", " ", value).strip()
+
+
+def _fold(value: str) -> str:
+    return _collapse(value).casefold()
@@ -0,0 +1,234 @@
+"""A customer table built from the sales: one row per ``customer_id``.
+
+The sales rows name a customer, but answering "what is customer X worth"
+from them means scanning every transaction. ``table`` instead keeps a small
+summary per customer, the usual RFM measures plus a few descriptive ones:
+
+- ``recency_days``: days from the last purchase to the latest one in the data
+- ``frequency``: number of purchases
+- ``monetary``: total spent
+- ``first_purchase`` and ``last_purchase``
+- ``favorite_category``: the category bought most often (ties go to the
+  one with more revenue)
+
+The table is saved in ``data/processed/customers`` sorted by ``customer_id``,
+in small row groups, so ``lookup`` and ``between`` read only the row groups
+whose ``customer_id`` range can hold the customers asked for::
+
+    from intro_datascience import customers
+
+    customers.lookup(["CUST042", "CUST131"])
+    customers.between("CUST100", "CUST199")
+
+Only purchases count: rows with a missing customer or a quantity or total of
+zero or less are left out, and categories are respelled as in ``cleaning``.
+
+The table is built from the saved partial state of two aggregates (see
+``incremental``), per customer and category and per customer. ``build``
+computes that state with one full scan: of the transaction store when sales
+arrive in batches through ``rollups.append_sales``, else of the sales
+dataset. After that, ``append_sales`` refreshes the state with each batch
+instead of rescanning the history. A table built from the sales dataset is
+rebuilt when the dataset changes.
+"""
+
+from collections.abc import Iterable
+from pathlib import Path
+
+import polars as pl
+
+from intro_datascience import cache, cleaning, datasets, transactions
+from intro_datascience.grouping import Measure
+from intro_datascience.incremental import AggregateState, update_all
+
+PURCHASES = Measure("purchases", "count")
+SPENT = Measure("spent", "sum", "total_amount")
+FIRST_PURCHASE = Measure("first_purchase", "min", "date")
+LAST_PURCHASE = Measure("last_purchase", "max", "date")
+
+# Row groups small enough that a lookup reads little more than its customers
+ROW_GROUP_SIZE = 16_384
+# Up to this many ids are looked up one equality each, which the row-group
+# statistics can prune; more ids are matched with one is_in, which prunes
+# only to the range from the smallest id to the largest
+EQUALITY_LOOKUPS = 16
+
+# Tables already loaded in this process, by path and modification time
+_loaded: dict[tuple[Path, int], pl.DataFrame] = {}
+
+
+def customer_dir(raw_dir: Path | None = None) -> Path:
+    return datasets.processed_dir(raw_dir) / "customers"
+
+
+def table_path(raw_dir: Path | None = None) -> Path:
+    return customer_dir(raw_dir) / "customers.parquet"
+
+
+def customer_states(raw_dir: Path | None = None) -> dict[str, AggregateState]:
+    """The saved partial state the table is built from, by name."""
+    state_dir = customer_dir(raw_dir) / "state"
+    return {
+        "categories": AggregateState(
+            state_dir / "categories.parquet", ("customer_id", "product_category"),
+            (PURCHASES, SPENT),
+        ),
+        "dates": AggregateState(
+            state_dir / "dates.parquet", ("customer_id",), (FIRST_PURCHASE, LAST_PURCHASE)
+        ),
+    }
+
+
+def table(raw_dir: Path | None = None) -> pl.DataFrame:
+    """The customer table, sorted by ``customer_id``.
+
+    It is built on first use, and rebuilt when it was built from other
+    sales than the current ones.
+    """
+    path = _current_table(raw_dir)
+    key = (path, path.stat().st_mtime_ns)
+    if key not in _loaded:
+        _loaded[key] = pl.read_parquet(path).with_columns(pl.col("customer_id").set_sorted())
+    return _loaded[key]
+
+
+def lookup(customer_ids: str | Iterable[str], raw_dir: Path | None = None) -> pl.DataFrame:
+    """The rows of ``customer_ids`` found in the table, in table order."""
+    ids = [customer_ids] if isinstance(customer_ids, str) else list(customer_ids)
+    customer_id = pl.col("customer_id")
+    if len(ids) <= EQUALITY_LOOKUPS:
+        wanted = pl.any_horizontal(pl.lit(False), *(customer_id == pl.lit(i) for i in ids))
+    else:
+        wanted = customer_id.is_in(pl.Series(ids, dtype=pl.String).implode())
+    return pl.scan_parquet(_current_table(raw_dir)).filter(wanted).collect()
+
+
+def between(low: str, high: str, raw_dir: Path | None = None) -> pl.DataFrame:
+    """The customers with ``low <= customer_id <= high``."""
+    in_range = pl.col("customer_id").is_between(pl.lit(low), pl.lit(high))
+    return pl.scan_parquet(_current_table(raw_dir)).filter(in_range).collect()
+
+
+def build(raw_dir: Path | None = None) -> pl.DataFrame:
+    """Compute the customer state from a full scan of the sales and save the table.
+
+    The transaction store is scanned if there is one, else the sales dataset.
+    """
+    store = transactions.sales_store(raw_dir)
+    states = customer_states(raw_dir)
+    for state in states.values():
+        state.reset()
+    update_all(states, _purchases(store.scan() if store.exists() else datasets.sales(raw_dir)))
+    _write_source(raw_dir, _current_source(raw_dir))
+    return _write_table(states, table_path(raw_dir))
+
+
+def update(result: transactions.UpsertResult, raw_dir: Path | None = None) -> pl.DataFrame:
+    """Refresh the table with the rows an upsert added and replaced.
+
+    Purchase counts and totals take the replaced versions back out. First
+    and last purchase dates cannot be taken back out, so the customers named
+    by a replaced version are recomputed from the transaction store.
+
+    State built from the sales dataset rather than the store is rebuilt from
+    the store, which the upsert has already brought up to date.
+    """
+    if _read_source(raw_dir) != "store":
+        return build(raw_dir)
+    states = customer_states(raw_dir)
+    added = _purchases(result.added.lazy())
+    if not result.replaced.height:
+        update_all(states, added)
+        return _write_table(states, table_path(raw_dir))
+
+    replaced = _purchases(result.replaced.lazy())
+    update_all({"categories": states["categories"]}, added, retract=replaced)
+    states["dates"].update(added)
+    affected = result.replaced.select(pl.col("customer_id").drop_nulls().unique())
+    current = transactions.sales_store(raw_dir).scan().join(
+        affected.lazy(), on="customer_id", how="semi"
+    )
+    states["dates"].replace(_purchases(current), affected)
+    return _write_table(states, table_path(raw_dir))
+
+
+def _source_path(raw_dir: Path | None) -> Path:
+    return customer_dir(raw_dir) / "state" / "source.txt"
+
+
+def _current_table(raw_dir: Path | None) -> Path:
+    """The table's path, after building it if it is missing or out of date."""
+    path = table_path(raw_dir)
+    if not path.exists() or _read_source(raw_dir) != _current_source(raw_dir):
+        build(raw_dir)
+    return path
+
+
+def _current_source(raw_dir: Path | None) -> str:
+    """What the state should be built from: ``"store"``, or a version of the sales.
+
+    The store keeps itself current through ``update``; the sales are
+    versioned by ``datasets.sales_version``.
+    """
+    if transactions.sales_store(raw_dir).exists():
+        return "store"
+    return "sales " + datasets.sales_version(raw_dir)
+
+
+def _read_source(raw_dir: Path | None) -> str | None:
+    """What the saved state was built from (see ``_current_source``), if anything."""
+    path = _source_path(raw_dir)
+    return path.read_text().strip() if path.exists() else None
+
+
+def _write_source(raw_dir: Path | None, source: str) -> None:
+    path = _source_path(raw_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(source)
+
+
+def _purchases(sales: pl.LazyFrame) -> pl.LazyFrame:
+    """The rows that count as purchases, with plain-text categories."""
+    valid = sales.filter(
+        pl.col("customer_id").is_not_null()
+        & (pl.col("quantity") > 0)
+        & (pl.col("total_amount") > 0)
+    )
+    return cleaning.normalize_categories(valid, {"product_category": None}).with_columns(
+        # Each batch gets its own Enum, so keep the saved state as text
+        pl.col("product_category").cast(pl.String)
+    )
+
+
+def _write_table(states: dict[str, AggregateState], path: Path) -> pl.DataFrame:
+    categories = states["categories"].result()
+    favorites = (
+        categories.sort(
+            ["customer_id", "purchases", "spent", "product_category"],
+            descending=[False, True, True, False],
+        )
+        .group_by("customer_id", maintain_order=True)
+        .agg(
+            pl.col("purchases").sum().cast(pl.UInt32).alias("frequency"),
+            pl.col("spent").sum().round(2).alias("monetary"),
+            pl.col("product_category").first().alias("favorite_category"),
+        )
+    )
+    customers = favorites.join(states["dates"].result(), on="customer_id", how="inner")
+    customers = customers.select(
+        "customer_id",
+        (pl.col("last_purchase").max() - pl.col("last_purchase"))
+        .dt.total_days()
+        .alias("recency_days"),
+        "frequency",
+        "monetary",
+        "first_purchase",
+        "last_purchase",
+        "favorite_category",
+    ).sort("customer_id")
+
+    cache.write_atomic(
+        path,
+        lambda p: customers.write_parquet(p, row_group_size=ROW_GROUP_SIZE, statistics=True),
+    )
+    return customers
@@ -0,0 +1,257 @@
+"""Lazy access to the course datasets in ``data/raw``.
+
+Every loader returns a ``pl.LazyFrame``. Nothing is read until ``.collect()``
+is called, so the columns and rows a cell actually uses are pushed down into
+the scan instead of loading the whole file up front::
+
+    import polars as pl
+    from intro_datascience import datasets
+
+    revenue = (
+        datasets.sales()
+        .group_by("region")
+        .agg(pl.col("total_amount").sum())
+        .collect()
+    )
+
+A ``raw_dir`` may instead hold ``students/``, ``sales/`` and ``weather/``
+folders of Parquet parts, as written by ``synthetic``; those are scanned
+directly.
+
+Columns come back with the types in ``schemas`` (enums, dates, narrow
+integers) rather than whatever Polars infers. Text sources (CSV, JSON) are
+converted to typed Parquet in ``data/processed`` on first use and the Parquet
+copy is scanned afterwards; see ``cache``. Pass ``cache=False`` to always read
+the raw file.
+"""
+
+import hashlib
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import polars as pl
+
+from intro_datascience import cache as _cache
+from intro_datascience import schemas
+
+# Point INTRO_DS_DATA_DIR at another folder to run the notebooks on other data
+DATA_DIR = Path(
+    os.environ.get("INTRO_DS_DATA_DIR", Path(__file__).resolve().parents[2] / "data")
+)
+RAW_DIR = DATA_DIR / "raw"
+PROCESSED_DIR = DATA_DIR / "processed"
+
+WEATHER_COLUMNS = (
+    "date",
+    "temperature_high",
+    "temperature_low",
+    "precipitation",
+    "humidity",
+    "wind_speed",
+    "condition",
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    """Which file a loader ended up scanning, and how long it took to open."""
+
+    source: Path
+    format: str
+    seconds: float
+
+    def __str__(self) -> str:
+        return f"{self.source.name} as {self.format} in {self.seconds * 1000:.1f} ms"
+
+
+def students(raw_dir: Path | None = None, cache: bool = True) -> pl.LazyFrame:
+    """Scan ``students.csv``."""
+    raw_dir = raw_dir or RAW_DIR
+    if (raw_dir / "students").is_dir():
+        return _scan_parts(raw_dir / "students", schemas.STUDENTS)
+    return _scan(raw_dir, "students.csv", pl.scan_csv, schemas.STUDENTS, cache)
+
+
+def sales(raw_dir: Path | None = None, cache: bool = True) -> pl.LazyFrame:
+    """Scan the sales transactions.
+
+    ``sales.ndjson`` (one object per line) is used when present. The bundled
+    ``sales.json`` is a single JSON array, which Polars can only read eagerly,
+    so without the cache every load parses the whole file.
+    """
+    raw_dir = raw_dir or RAW_DIR
+    if (raw_dir / "sales").is_dir():
+        return _scan_parts(raw_dir / "sales", schemas.SALES)
+    if (raw_dir / "sales.ndjson").exists():
+        name, read = "sales.ndjson", pl.scan_ndjson
+    else:
+        name, read = "sales.json", pl.read_json
+    return _scan(raw_dir, name, read, schemas.SALES, cache)
+
+
+def weather(raw_dir: Path | None = None, cache: bool = True) -> pl.LazyFrame:
+    """Scan the weather observations in the fastest available format.
+
+    See ``open_weather`` for the order formats are tried in.
+    """
+    frame, _ = open_weather(raw_dir, cache=cache)
+    return frame
+
+
+def open_weather(
+    raw_dir: Path | None = None, cache: bool = True
+) -> tuple[pl.LazyFrame, LoadReport]:
+    """Scan the weather observations and report which file was used.
+
+    A ``weather/`` folder of Parquet parts is used when present. Otherwise
+    formats are tried fastest first:
+
+    1. ``weather.arrow`` (Arrow IPC, memory-mapped)
+    2. ``weather.parquet``
+    3. a Parquet copy of ``weather.csv`` in ``data/processed``, rebuilt when
+       the CSV changes (only with ``cache=True``)
+    4. ``weather.csv`` itself
+
+    The Arrow and Parquet files are taken as copies of ``weather.csv`` when
+    it exists, and skipped once the CSV's content has changed since they
+    were made (see ``cache.copy_is_current``).
+
+    Each candidate must have all of ``WEATHER_COLUMNS``. A candidate that is
+    unreadable or has the wrong columns is logged and skipped; ``ValueError``
+    is raised if none is usable.
+    """
+    raw_dir = raw_dir or RAW_DIR
+    if (raw_dir / "weather").is_dir():
+        start = time.perf_counter()
+        frame = _scan_parts(raw_dir / "weather", schemas.WEATHER)
+        return frame, LoadReport(raw_dir / "weather", "parquet parts", time.perf_counter() - start)
+
+    ipc_path = raw_dir / "weather.arrow"
+    parquet_path = raw_dir / "weather.parquet"
+    csv_path = raw_dir / "weather.csv"
+
+    # Each candidate is (format, file it comes from, function returning the path to scan)
+    candidates = []
+    cache_dir = processed_dir(raw_dir)
+    for fmt, path in (("ipc", ipc_path), ("parquet", parquet_path)):
+        if not path.exists():
+            continue
+        if csv_path.exists() and not _cache.copy_is_current(path, csv_path, cache_dir):
+            logger.warning("%s is out of date with %s, ignoring it", path.name, csv_path.name)
+            continue
+        candidates.append((fmt, path, lambda path=path: path))
+    if csv_path.exists():
+        if cache:
+            candidates.append((
+                "parquet",
+                csv_path,
+                lambda: _cache.cached_parquet(
+                    csv_path,
+                    lambda path: schemas.apply(pl.scan_csv(path), schemas.WEATHER),
+                    processed_dir(raw_dir),
+                    key=schemas.fingerprint(schemas.WEATHER),
+                ),
+            ))
+        candidates.append(("csv", csv_path, lambda: csv_path))
+
+    scanners = {
+        "ipc": lambda path: pl.scan_ipc(path, memory_map=True),
+        # Polars memory-maps local Parquet files on its own
+        "parquet": pl.scan_parquet,
+        "csv": pl.scan_csv,
+    }
+    # Casting is a no-op for the typed cache and cheap for the small raw files
+    scanners = {
+        fmt: lambda path, scan=scan: schemas.apply(scan(path), schemas.WEATHER)
+        for fmt, scan in scanners.items()
+    }
+    for fmt, origin, resolve in candidates:
+        start = time.perf_counter()
+        try:
+            path = resolve()
+            frame = scanners[fmt](path)
+            missing = set(WEATHER_COLUMNS) - set(frame.collect_schema().names())
+        except (OSError, pl.exceptions.PolarsError) as e:
+            logger.warning("Could not read %s: %s", origin.name, e)
+            continue
+        if missing:
+            logger.warning("%s is missing columns %s", origin.name, sorted(missing))
+            continue
+        report = LoadReport(source=path, format=fmt, seconds=time.perf_counter() - start)
+        logger.info("Loaded weather from %s", report)
+        return frame, report
+
+    raise ValueError(f"No usable weather data in {raw_dir}")
+
+
+def with_calendar(frame: pl.LazyFrame, column: str = "date") -> pl.LazyFrame:
+    """Add ``year``, ``month``, ``day`` and ``week`` (ISO week) columns.
+
+    ``column`` must already be a ``pl.Date``, which the loaders guarantee, so
+    no text is parsed here. The new columns are cheap integer extractions and,
+    on a ``LazyFrame``, any that a query does not use are never computed.
+    """
+    date = pl.col(column)
+    return frame.with_columns(
+        date.dt.year().alias("year"),
+        date.dt.month().alias("month"),
+        date.dt.day().alias("day"),
+        date.dt.week().alias("week"),
+    )
+
+
+def parts_version(name: str, raw_dir: Path | None = None) -> str:
+    """Version string for the ``name/`` folder of Parquet parts, or ``""`` if none.
+
+    Query plans over a folder only name its ``*.parquet`` glob, so anything
+    keyed on the plan (like ``rollups``) also needs this to notice new parts.
+    """
+    directory = (raw_dir or RAW_DIR) / name
+    if not directory.is_dir():
+        return ""
+    return _cache.stat_fingerprint(list(directory.glob("*.parquet")))
+
+
+def sales_version(raw_dir: Path | None = None) -> str:
+    """Version string for the sales in ``raw_dir``.
+
+    Hashes the unoptimized query plan of ``sales()``, which names the
+    hash-named Parquet copy of ``sales.json``, with ``parts_version("sales")``.
+    Results derived from the sales (rollups, partitions, the customer table)
+    are rebuilt when it changes.
+    """
+    plan = sales(raw_dir).explain(optimized=False) + parts_version("sales", raw_dir)
+    return hashlib.sha256(plan.encode()).hexdigest()[:16]
+
+
+def processed_dir(raw_dir: Path | None = None) -> Path:
+    """Where files derived from ``raw_dir`` are written.
+
+    ``data/processed`` for the course data, and a ``processed`` folder inside
+    any other ``raw_dir`` so that results from different data never mix.
+    """
+    if raw_dir is None or raw_dir.resolve() == RAW_DIR.resolve():
+        return PROCESSED_DIR
+    return raw_dir / "processed"
+
+
+def _scan_parts(directory: Path, schema: pl.Schema) -> pl.LazyFrame:
+    return schemas.apply(pl.scan_parquet(directory / "*.parquet"), schema)
+
+
+def _scan(raw_dir: Path, name: str, read, schema: pl.Schema, cache: bool) -> pl.LazyFrame:
+    """Read ``raw_dir / name`` with ``read`` and cast it to ``schema``."""
+    def typed(path: Path) -> pl.LazyFrame:
+        return schemas.apply(read(path).lazy(), schema)
+
+    if not cache:
+        return typed(raw_dir / name)
+    path = _cache.cached_parquet(
+        raw_dir / name, typed, processed_dir(raw_dir), key=schemas.fingerprint(schema)
+    )
+    return pl.scan_parquet(path)
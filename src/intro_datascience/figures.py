@@ -0,0 +1,128 @@
+"""Cache built Plotly figures on disk, keyed by their inputs.
+
+Re-running a figure cell rebuilds the figure and serializes it again, even
+when its data has not changed. ``cached`` builds a figure once and serves
+the saved JSON afterwards::
+
+    from intro_datascience import figures
+
+    fig7 = figures.cached(charts.histogram, students, "test_score", bins=10)
+    fig1 = figures.cached(px.line, weather.head(30).collect(), x="date", y="temperature_high")
+
+The key hashes the build function's name, its arguments and the versions of
+Polars and Plotly. A ``DataFrame`` argument is hashed by content. A
+``LazyFrame`` is hashed by its serialized query plan, which holds any
+in-memory data it starts from, plus the sizes and modification times of the
+files it scans: a plan only names its files, and ``weather.parquet`` or a
+folder of parts can change without their paths changing. Nothing is read
+from those files, so a large scan costs no more to key than a small one.
+
+Figures are kept in ``data/processed/figures``. When the folder grows past
+``max_bytes`` the least recently used figures are deleted.
+"""
+
+import hashlib
+import logging
+import os
+import re
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+
+from intro_datascience import cache, datasets, schemas
+from intro_datascience.imports import lazy_import
+
+logger = logging.getLogger(__name__)
+
+pio = lazy_import("plotly.io")
+plotly = lazy_import("plotly")
+
+MAX_BYTES = 256 * 2**20
+
+# A scan in an unoptimized plan, e.g. "Parquet SCAN [a.parquet, ... 4 other sources]"
+_SCAN = re.compile(r"SCAN \[(.*?)(?:, \.\.\. (\d+) other sources?)?\]")
+
+
+def figure_dir(raw_dir: Path | None = None) -> Path:
+    return datasets.processed_dir(raw_dir) / "figures"
+
+
+def cached(
+    build: Callable[..., Any],
+    *args: Any,
+    cache_dir: Path | None = None,
+    max_bytes: int = MAX_BYTES,
+    **kwargs: Any,
+) -> Any:
+    """``build(*args, **kwargs)``, or the saved figure from an earlier identical call."""
+    cache_dir = cache_dir or figure_dir()
+    path = cache_dir / f"{figure_key(build, *args, **kwargs)}.json"
+    if path.exists():
+        os.utime(path)  # mark as recently used
+        return pio.from_json(path.read_text(encoding="utf-8"))
+
+    fig = build(*args, **kwargs)
+    cache.write_atomic(path, lambda p: p.write_text(fig.to_json(), encoding="utf-8"))
+    evict(cache_dir, max_bytes)
+    return fig
+
+
+def figure_key(build: Callable[..., Any], *args: Any, **kwargs: Any) -> str:
+    """Hash of a figure's build function, arguments and library versions."""
+    digest = hashlib.sha256()
+    name = f"{getattr(build, '__module__', '')}.{getattr(build, '__qualname__', repr(build))}"
+    digest.update(f"{name}\npolars {pl.__version__}\nplotly {plotly.__version__}\n".encode())
+    for value in [*args, *sorted(kwargs.items())]:
+        digest.update(_fingerprint(value).encode())
+        digest.update(b"\n")
+    return digest.hexdigest()[:24]
+
+
+def evict(cache_dir: Path, max_bytes: int = MAX_BYTES) -> None:
+    """Delete the least recently used figures until the folder fits in ``max_bytes``."""
+    files = sorted(cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime_ns)
+    total = sum(p.stat().st_size for p in files)
+    for path in files:
+        if total <= max_bytes:
+            break
+        total -= path.stat().st_size
+        path.unlink(missing_ok=True)
+        logger.info("Evicted cached figure %s", path.name)
+
+
+def clear(cache_dir: Path | None = None) -> None:
+    """Delete every cached figure."""
+    for path in (cache_dir or figure_dir()).glob("*.json"):
+        path.unlink()
+
+
+def _fingerprint(value: Any) -> str:
+    if isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], str):
+        return f"{value[0]}={_fingerprint(value[1])}"  # a keyword argument
+    if isinstance(value, pl.DataFrame):
+        rows = schemas.hashable(value).hash_rows(seed=0).to_numpy().tobytes()
+        return f"DataFrame {value.schema!r} {hashlib.sha256(rows).hexdigest()}"
+    if isinstance(value, pl.LazyFrame):
+        plan = hashlib.sha256(value.serialize()).hexdigest()
+        files = cache.stat_fingerprint(_scanned_files(value))
+        return f"LazyFrame {plan} {files}"
+    if isinstance(value, pl.Series):
+        return f"Series {value.name} {value.dtype} {_fingerprint(value.to_frame())}"
+    return repr(value)
+
+
+def _scanned_files(frame: pl.LazyFrame) -> list[Path]:
+    """The local files ``frame`` scans, as named by its unoptimized plan.
+
+    A plan lists only the first of several files, so the others are taken
+    to be its siblings with the same suffix, as in a folder of parts.
+    """
+    files = set()
+    for match in _SCAN.finditer(frame.explain(optimized=False)):
+        listed = [Path(name) for name in match.group(1).split(", ")]
+        if match.group(2):
+            listed += listed[0].parent.glob(f"*{listed[0].suffix}")
+        files.update(path for path in listed if path.is_file())
+    return sorted(files)
@@ -0,0 +1,133 @@
+"""Several group-bys from a single scan (grouping sets).
+
+A dashboard often needs the same measures grouped several ways: revenue by
+month, by category, by region. Running one ``group_by`` per view reads the
+data once per view. ``grouping_sets`` instead groups once by every key
+column together, then rolls that small partial result up to each view::
+
+    views = grouping_sets(
+        sales,
+        {"by_region": ["region"], "by_category": ["product_category"]},
+        [Measure("revenue", "sum", "total_amount"), Measure("transactions", "count")],
+    )
+    views["by_region"]
+
+This only works for measures whose partial results can be combined, which
+is what ``Measure`` describes: sums, counts, minimums, maximums, and means
+(kept as a sum and a count until the end). The partial result has one row
+per combination of key values, so the key columns should be low-cardinality
+like the sales categories.
+"""
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+import polars as pl
+
+AGGREGATIONS = ("sum", "count", "min", "max", "mean")
+
+# How partial states of each kind combine: counts and sums add up
+_MERGE = {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+
+
+@dataclass(frozen=True)
+class Measure:
+    """An aggregate that can be computed in parts and combined.
+
+    ``how`` is one of ``AGGREGATIONS``. ``count`` without a ``column`` counts
+    rows; with a column it counts that column's non-null values.
+    """
+
+    alias: str
+    how: str
+    column: str | None = None
+
+    def __post_init__(self):
+        if self.how not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation {self.how!r}, expected one of {AGGREGATIONS}")
+        if self.column is None and self.how != "count":
+            raise ValueError(f"{self.how!r} needs a column")
+
+    def partial(self) -> list[pl.Expr]:
+        """Aggregates over raw rows, named after the state they hold."""
+        if self.how == "count":
+            counted = pl.len() if self.column is None else pl.col(self.column).count()
+            return [counted.alias(self._state("count"))]
+        col = pl.col(self.column)
+        if self.how == "mean":
+            return [col.sum().alias(self._state("sum")), col.count().alias(self._state("count"))]
+        return [getattr(col, self.how)().alias(self._state(self.how))]
+
+    def merge(self) -> list[pl.Expr]:
+        """Aggregates combining partial states, keeping the same names."""
+        merges = []
+        for name in self.state_columns():
+            how = name.rsplit("__", 1)[1]
+            merges.append(getattr(pl.col(name), _MERGE[how])().alias(name))
+        return merges
+
+    def finish(self) -> pl.Expr:
+        """The final value, computed from merged states."""
+        if self.how == "mean":
+            return (pl.col(self._state("sum")) / pl.col(self._state("count"))).alias(self.alias)
+        return pl.col(self._state(self.how)).alias(self.alias)
+
+    def state_columns(self) -> list[str]:
+        if self.how == "mean":
+            return [self._state("sum"), self._state("count")]
+        return [self._state(self.how)]
+
+    def _state(self, how: str) -> str:
+        return f"__{self.alias}__{how}"
+
+
+def partial_aggregate(
+    frame: pl.LazyFrame, keys: Sequence[str], measures: Sequence[Measure]
+) -> pl.LazyFrame:
+    """Group ``frame`` by ``keys`` and keep the mergeable state of ``measures``."""
+    partials = [e for m in measures for e in m.partial()]
+    if not keys:
+        return frame.select(partials)
+    return frame.group_by(keys).agg(partials)
+
+
+def merge_partials(
+    partial: pl.LazyFrame, keys: Sequence[str], measures: Sequence[Measure]
+) -> pl.LazyFrame:
+    """Combine partial aggregates down to ``keys``, still as partial state.
+
+    ``partial`` may hold several rows per key, for example the stacked partial
+    aggregates of two batches of data.
+    """
+    merges = [e for m in measures for e in m.merge()]
+    return partial.group_by(keys).agg(merges) if keys else partial.select(merges)
+
+
+def finish(
+    partial: pl.LazyFrame, keys: Sequence[str], measures: Sequence[Measure]
+) -> pl.LazyFrame:
+    """Turn merged partial state into the final measure columns."""
+    return partial.select(*keys, *(m.finish() for m in measures))
+
+
+def roll_up(
+    partial: pl.LazyFrame, keys: Sequence[str], measures: Sequence[Measure]
+) -> pl.LazyFrame:
+    """Combine a partial aggregate down to ``keys`` and finish the measures."""
+    return finish(merge_partials(partial, keys, measures), keys, measures)
+
+
+def grouping_sets(
+    frame: pl.LazyFrame,
+    sets: Mapping[str, Sequence[str]],
+    measures: Sequence[Measure],
+) -> dict[str, pl.DataFrame]:
+    """Compute ``measures`` for every grouping in ``sets`` from one scan.
+
+    ``sets`` maps a result name to its key columns; an empty list gives a
+    single grand-total row. Results are returned unsorted, by name.
+    """
+    keys = list(dict.fromkeys(k for set_keys in sets.values() for k in set_keys))
+    partial = partial_aggregate(frame, keys, measures).collect().lazy()
+    results = pl.collect_all([roll_up(partial, set_keys, measures) for set_keys in sets.values()])
+    return dict(zip(sets, results))
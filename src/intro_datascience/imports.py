@@ -0,0 +1,149 @@
+"""Lazy imports and a per-notebook import cost report.
+
+Importing ``plotly.express`` takes about a quarter of a second and Polars
+about as long again, all before a notebook shows anything. ``lazy_import``
+returns a module whose import is deferred until an attribute is first
+used, so a setup cell can name everything the notebook needs while only the
+cells that draw a figure pay for Plotly::
+
+    from intro_datascience.imports import lazy_import
+
+    px = lazy_import("plotly.express")
+    go = lazy_import("plotly.graph_objects")
+
+``import_costs`` measures what the import statements of a notebook cost in a
+fresh interpreter (with marimo already loaded, as in a kernel), statement by
+statement, and lists imported names that no cell uses::
+
+    uv run python -m intro_datascience.imports example_notebooks/*.py exercises/*.py
+"""
+
+import argparse
+import ast
+import importlib.util
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+
+from intro_datascience import runner
+
+_MARKER = "--intro-datascience-statement--"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """The module ``name``, imported when one of its attributes is first used.
+
+    Parent packages are imported straight away, as Python needs them to find
+    the module. A module that is already imported is returned as it is.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+@dataclass
+class ImportCost:
+    statement: str
+    seconds: float
+    modules: int  # modules newly imported by this statement
+
+
+@dataclass
+class NotebookImports:
+    notebook: Path
+    costs: list[ImportCost]
+    unused: list[str] = field(default_factory=list)
+
+    @property
+    def seconds(self) -> float:
+        return sum(c.seconds for c in self.costs)
+
+
+def import_costs(path: Path, python: str = sys.executable) -> NotebookImports:
+    """Time each import statement in the notebook at ``path`` in a fresh process.
+
+    Statements run in notebook order, so a module shared by two statements is
+    charged to the first.
+    """
+    statements, unused = _notebook_imports(path)
+    lines = ["import marimo", "import sys"]
+    for statement in statements:
+        lines += [f"sys.stderr.write({_MARKER!r} + '\\n')", statement]
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", "\n".join(lines)],
+        capture_output=True,
+        text=True,
+        cwd=path.parent,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing the modules of {path} failed:\n{result.stderr}")
+
+    # Everything before the first marker is marimo's own start-up
+    sections = result.stderr.split(_MARKER + "\n")[1:]
+    costs = []
+    for statement, section in zip(statements, sections):
+        microseconds, modules = 0, 0
+        for line in section.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|", 2)
+            if not cumulative.strip().isdigit():
+                continue  # the header line
+            modules += 1
+            if not name[1:].startswith(" "):  # top level, not a nested import
+                microseconds += int(cumulative)
+        costs.append(ImportCost(statement, microseconds / 1e6, modules))
+    return NotebookImports(path, costs, unused)
+
+
+def _notebook_imports(path: Path) -> tuple[list[str], list[str]]:
+    """Import statements in the notebook's cells, and the names no cell uses."""
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    cells = [
+        node for node in tree.body
+        if isinstance(node, ast.FunctionDef) and any(runner._is_app_cell(d) for d in node.decorator_list)
+    ]
+    statements, bound, used = [], [], set()
+    for cell in cells:
+        used.update(arg.arg for arg in cell.args.args)
+        body = cell.body[:-1] if cell.body and isinstance(cell.body[-1], ast.Return) else cell.body
+        for node in (n for stmt in body for n in ast.walk(stmt)):
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                statements.append(ast.unparse(node))
+                bound += [(a.asname or a.name).split(".")[0] for a in node.names]
+            elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+                used.add(node.id)
+    unused = [name for name in dict.fromkeys(bound) if name not in used]
+    return statements, unused
+
+
+def format_costs(reports: list[NotebookImports]) -> str:
+    lines = []
+    for report in sorted(reports, key=lambda r: r.seconds, reverse=True):
+        lines.append(f"{report.notebook}  {report.seconds * 1000:.0f} ms")
+        for cost in sorted(report.costs, key=lambda c: c.seconds, reverse=True):
+            lines.append(f"  {cost.seconds * 1000:>8.1f} ms {cost.modules:>5} modules  {cost.statement}")
+        if report.unused:
+            lines.append(f"  unused: {', '.join(report.unused)}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the import cost of marimo notebooks.")
+    parser.add_argument("notebooks", type=Path, nargs="+")
+    args = parser.parse_args()
+    print(format_costs([import_costs(path.resolve()) for path in args.notebooks]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Aggregates that are updated with new batches instead of recomputed.
+
+An ``AggregateState`` keeps the mergeable partial state of its measures
+(sums, counts, minimums, maximums; means as a sum and a count) per key in a
+Parquet file. ``update`` aggregates only the new batch and merges it into the
+saved state, so refreshing costs time proportional to the batch, not to the
+whole history::
+
+    state = AggregateState(path, ["region"], [Measure("revenue", "sum", "total_amount")])
+    state.update(todays_sales)
+    state.result()
+
+A state does not know which batches it has already seen: folding the same
+batch in twice counts it twice. Rows folded in earlier can be taken out
+again with ``retract``, for measures built from sums and counts only; a key
+whose rows have all been retracted disappears from the result. For other
+measures, ``replace`` recomputes chosen keys from all of their rows.
+"""
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import polars as pl
+
+from intro_datascience import cache
+from intro_datascience.grouping import Measure, finish, merge_partials, partial_aggregate
+
+# State kinds that can be subtracted again; a minimum or maximum cannot
+_RETRACTABLE = ("sum", "count")
+
+
+@dataclass(frozen=True)
+class AggregateState:
+    """Mergeable aggregate state for ``measures`` by ``keys``, saved at ``path``."""
+
+    path: Path
+    keys: tuple[str, ...]
+    measures: tuple[Measure, ...]
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def update(self, batch: pl.DataFrame | pl.LazyFrame) -> None:
+        """Fold the rows of ``batch`` into the saved state."""
+        self._merge(partial_aggregate(batch.lazy(), self.keys, self.measures))
+
+    def retract(self, batch: pl.DataFrame | pl.LazyFrame) -> None:
+        """Take the rows of ``batch``, folded in earlier, back out of the state."""
+        partial = partial_aggregate(batch.lazy(), self.keys, self.measures)
+        self._merge(_negated(partial, self.measures))
+
+    def replace(self, rows: pl.DataFrame | pl.LazyFrame, keys: pl.DataFrame) -> None:
+        """Recompute the state of ``keys`` from ``rows``, which hold all of their rows.
+
+        ``keys`` has the key columns; a key with no rows left in ``rows``
+        is dropped from the state.
+        """
+        partial = partial_aggregate(rows.lazy(), self.keys, self.measures).collect()
+        if self.exists():
+            kept = pl.read_parquet(self.path).join(keys, on=list(self.keys), how="anti")
+            partial = pl.concat([kept, partial], how="vertical_relaxed")
+        self._write(partial)
+
+    def result(self) -> pl.DataFrame:
+        """The finished aggregate over every batch folded in so far."""
+        if not self.exists():
+            raise FileNotFoundError(f"No aggregate state at {self.path}, call update() first")
+        return finish(pl.scan_parquet(self.path), self.keys, self.measures).collect()
+
+    def reset(self) -> None:
+        """Forget all batches."""
+        self.path.unlink(missing_ok=True)
+
+    def _merge(self, partial: pl.LazyFrame) -> None:
+        """Merge a partial aggregate (possibly at a finer grain) into the state."""
+        states = [c for m in self.measures for c in m.state_columns()]
+        partial = partial.select(*self.keys, *states)
+        if self.exists():
+            # Read the saved state fully before overwriting the file
+            saved = pl.read_parquet(self.path).lazy()
+            partial = pl.concat([saved, partial], how="vertical_relaxed")
+        merged = merge_partials(partial, self.keys, self.measures)
+        counts = [c for c in states if c.endswith("__count")]
+        if counts:
+            # Drop keys whose rows have all been retracted
+            merged = merged.filter(pl.any_horizontal(pl.col(c) != 0 for c in counts))
+            # Retracting widens counts to signed integers; store them as a
+            # fresh aggregate counts them, so results match a full rebuild
+            merged = merged.with_columns(pl.col(counts).cast(pl.UInt32))
+        self._write(merged.collect())
+
+    def _write(self, state: pl.DataFrame) -> None:
+        cache.write_atomic(self.path, state.write_parquet)
+
+
+def update_all(
+    states: Mapping[str, AggregateState],
+    batch: pl.DataFrame | pl.LazyFrame,
+    retract: pl.DataFrame | pl.LazyFrame | None = None,
+) -> None:
+    """Fold ``batch`` into several states while aggregating the batch once.
+
+    The batch is grouped by every key of every state together, and each state
+    merges that partial result down to its own keys. Rows of ``retract`` are
+    taken out in the same write, e.g. the old versions of updated records.
+    """
+    keys = list(dict.fromkeys(k for state in states.values() for k in state.keys))
+    measures: Sequence[Measure] = list(
+        dict.fromkeys(m for state in states.values() for m in state.measures)
+    )
+    partial = partial_aggregate(batch.lazy(), keys, measures)
+    if retract is not None:
+        removed = _negated(partial_aggregate(retract.lazy(), keys, measures), measures)
+        partial = pl.concat([partial, removed], how="vertical_relaxed")
+    partial = partial.collect().lazy()
+    for state in states.values():
+        state._merge(partial)
+
+
+def _negated(partial: pl.LazyFrame, measures: Sequence[Measure]) -> pl.LazyFrame:
+    """A partial aggregate that cancels out ``partial`` when merged with it."""
+    states = [c for m in measures for c in m.state_columns()]
+    fixed = [c for c in states if c.rsplit("__", 1)[1] not in _RETRACTABLE]
+    if fixed:
+        raise ValueError(f"Cannot retract rows from minimum or maximum states {fixed}")
+    # Counts are unsigned, so widen them before flipping the sign
+    return partial.with_columns(
+        -(pl.col(c).cast(pl.Int64) if c.endswith("__count") else pl.col(c)) for c in states
+    )
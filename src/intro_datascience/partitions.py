@@ -0,0 +1,138 @@
+"""Cleaned sales laid out in year and month folders, read one month at a time.
+
+A question about one month still scans every transaction when the sales
+are a single file. ``write_sales`` instead writes the cleaned sales (see
+``cleaning``) into Hive-style folders::
+
+    data/processed/sales/
+    ├── _source.json              the sales query the folders were written from
+    ├── year=2024/month=01/00000000.parquet
+    ├── year=2024/month=02/00000000.parquet
+    └── ...
+
+``sales`` reads them back, writing them first if they are missing or were
+written from other data. ``start`` and ``end`` dates pick the folders to
+read, so a one-month query opens one month's files and no others::
+
+    from intro_datascience import partitions
+
+    march = partitions.sales(start=date(2024, 3, 1), end=date(2024, 3, 31))
+    march.select(pl.col("total_amount").sum()).collect()
+
+``year`` and ``month`` come back as columns, typed as in
+``datasets.with_calendar``. Filters on them also skip folders, since Polars
+prunes Hive partitions from predicates on the partition columns.
+"""
+
+import json
+import logging
+import shutil
+from datetime import date
+from pathlib import Path
+
+import polars as pl
+
+from intro_datascience import cache, cleaning, datasets
+
+logger = logging.getLogger(__name__)
+
+# Partition columns, typed like datasets.with_calendar
+PARTITION_SCHEMA = pl.Schema({"year": pl.Int32, "month": pl.Int8})
+
+
+def sales_root(raw_dir: Path | None = None) -> Path:
+    return datasets.processed_dir(raw_dir) / "sales"
+
+
+def write(frame: pl.DataFrame | pl.LazyFrame, root: Path, column: str = "date") -> Path:
+    """Write ``frame`` into ``root/year=YYYY/month=MM`` folders by its date ``column``.
+
+    The query runs on the streaming engine, and rows keep their order within
+    each folder. ``root`` is replaced only once every folder is written.
+    """
+    date_column = pl.col(column)
+    partitioned = frame.lazy().with_columns(
+        date_column.dt.year().alias("year"),
+        date_column.dt.month().cast(pl.String).str.zfill(2).alias("month"),
+    )
+    tmp_root = root.with_name(root.name + ".tmp")
+    shutil.rmtree(tmp_root, ignore_errors=True)
+    partitioned.sink_parquet(
+        pl.PartitionByKey(tmp_root, by=["year", "month"], include_key=False),
+        mkdir=True,
+        engine="streaming",
+    )
+
+    cache.replace_directory(tmp_root, root)
+    return root
+
+
+def scan(
+    root: Path, start: date | None = None, end: date | None = None, column: str = "date"
+) -> pl.LazyFrame:
+    """Scan the folders under ``root`` that hold dates from ``start`` to ``end``.
+
+    Both ends are inclusive and either can be left out. Only the month
+    folders overlapping the range are opened, and rows outside it within
+    those months are filtered out.
+    """
+    first = (start.year, start.month) if start else None
+    last = (end.year, end.month) if end else None
+    paths = [
+        path
+        for (year, month), path in months(root).items()
+        if (first is None or (year, month) >= first) and (last is None or (year, month) <= last)
+    ]
+    if not paths:
+        raise ValueError(f"No partitions under {root} hold dates from {start} to {end}")
+
+    frame = pl.scan_parquet(
+        [path / "*.parquet" for path in paths],
+        hive_partitioning=True,
+        hive_schema=PARTITION_SCHEMA,
+    )
+    if start:
+        frame = frame.filter(pl.col(column) >= start)
+    if end:
+        frame = frame.filter(pl.col(column) <= end)
+    return frame
+
+
+def months(root: Path) -> dict[tuple[int, int], Path]:
+    """The month folders under ``root``, by (year, month), in order."""
+    found = {}
+    for path in root.glob("year=*/month=*"):
+        year = int(path.parent.name.removeprefix("year="))
+        month = int(path.name.removeprefix("month="))
+        found[year, month] = path
+    return dict(sorted(found.items()))
+
+
+def write_sales(raw_dir: Path | None = None) -> Path:
+    """Write the cleaned sales in ``raw_dir`` into year and month folders."""
+    root = sales_root(raw_dir)
+    source = _sales_source(raw_dir)
+    write(cleaning.clean_sales(datasets.sales(raw_dir)), root)
+    (root / "_source.json").write_text(json.dumps({"source": source}))
+    logger.info("Wrote partitioned sales to %s", root)
+    return root
+
+
+def sales(
+    raw_dir: Path | None = None, start: date | None = None, end: date | None = None
+) -> pl.LazyFrame:
+    """The cleaned sales from ``start`` to ``end``, read from the month folders.
+
+    The folders are written first if they are missing or out of date.
+    """
+    root = sales_root(raw_dir)
+    manifest = root / "_source.json"
+    written = json.loads(manifest.read_text())["source"] if manifest.exists() else None
+    if written != _sales_source(raw_dir):
+        write_sales(raw_dir)
+    return scan(root, start, end)
+
+
+def _sales_source(raw_dir: Path | None) -> str:
+    """Version of the sales the folders are written from."""
+    return datasets.sales_version(raw_dir)
@@ -0,0 +1,266 @@
+"""Opt-in profiling of every cell in a notebook, without editing it.
+
+``profile_notebook`` runs a notebook through ``runner`` and, for each cell:
+
+- samples the Python call stack every few milliseconds, so time spent in
+  Polars, Plotly, statsmodels and the notebook's own code can be told apart
+  (time inside Polars' Rust engine shows up under the Python call that
+  started it, such as ``LazyFrame.collect``)
+- records the optimized query plan (``explain()``) of every ``LazyFrame``
+  the cell collects itself; the plans Polars runs inside eager ``DataFrame``
+  methods are left out, and plans are explained after the cell has run so
+  that explaining them does not add to its time
+
+The result displays as a table in a marimo notebook and exports to the
+speedscope format (https://www.speedscope.app), one profile per cell::
+
+    from intro_datascience import profiling
+
+    profile = profiling.profile_notebook("02_data_wrangling.py")
+    profile.save_speedscope("02_profile.speedscope.json")
+    profile
+
+or from a terminal::
+
+    uv run python -m intro_datascience.profiling example_notebooks/03_plotting.py \\
+        --speedscope profile.speedscope.json
+"""
+
+import argparse
+import contextlib
+import html
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import polars as pl
+
+from intro_datascience import runner
+
+# Samples are attributed to the innermost frame from one of these packages
+LIBRARIES = ("polars", "plotly", "statsmodels", "pandas", "marimo")
+SAMPLE_INTERVAL = 0.002
+
+Frame = tuple[str, str, int]  # function name, file, first line
+
+
+@dataclass
+class CellProfile:
+    cell: runner.Cell
+    report: runner.CellReport | None = None
+    stacks: list[tuple[Frame, ...]] = field(default_factory=list)
+    weights: list[float] = field(default_factory=list)
+    plans: list[str] = field(default_factory=list)
+
+    def time_by_library(self) -> dict[str, float]:
+        """Sampled seconds per library in ``LIBRARIES``, the rest as ``"other"``."""
+        totals: Counter[str] = Counter()
+        for stack, weight in zip(self.stacks, self.weights):
+            totals[_library(stack)] += weight
+        return dict(totals.most_common())
+
+    def hottest_functions(self, n: int = 5) -> list[tuple[str, float]]:
+        """Functions with the most sampled self time."""
+        totals: Counter[str] = Counter()
+        for stack, weight in zip(self.stacks, self.weights):
+            name, file, _ = stack[-1]
+            totals[f"{name} ({Path(file).name})"] += weight
+        return totals.most_common(n)
+
+
+@dataclass
+class NotebookProfile:
+    notebook: Path
+    cells: list[CellProfile]
+
+    def to_speedscope(self) -> dict:
+        """The profile in speedscope's file format, one profile per cell."""
+        frames: dict[Frame, int] = {}
+        profiles = []
+        for cell in self.cells:
+            samples = [[frames.setdefault(f, len(frames)) for f in stack] for stack in cell.stacks]
+            profiles.append({
+                "type": "sampled",
+                "name": cell.cell.label,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(cell.weights),
+                "samples": samples,
+                "weights": cell.weights,
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.notebook.name,
+            "exporter": "intro_datascience.profiling",
+            "shared": {
+                "frames": [{"name": n, "file": f, "line": line} for n, f, line in frames]
+            },
+            "profiles": profiles,
+        }
+
+    def save_speedscope(self, path: Path | str) -> None:
+        Path(path).write_text(json.dumps(self.to_speedscope()))
+
+    def _mime_(self) -> tuple[str, str]:
+        """Show as an HTML table when this is a marimo cell's output."""
+        return "text/html", self.to_html()
+
+    def to_html(self) -> str:
+        rows = []
+        ranked = sorted(self.cells, key=lambda c: c.report.wall_seconds if c.report else 0, reverse=True)
+        for cell in ranked:
+            report = cell.report
+            libraries = ", ".join(f"{k} {v:.3f}s" for k, v in cell.time_by_library().items())
+            hottest = "<br>".join(html.escape(f"{n}: {s:.3f}s") for n, s in cell.hottest_functions(3))
+            plans = "".join(f"<pre>{html.escape(p)}</pre>" for p in cell.plans)
+            rows.append(
+                f"<tr><td>{html.escape(cell.cell.label)}</td>"
+                f"<td>{report.status if report else ''}</td>"
+                f"<td>{report.wall_seconds if report else 0:.3f}</td>"
+                f"<td>{html.escape(libraries)}</td><td>{hottest}</td>"
+                f"<td>{f'<details><summary>{len(cell.plans)}</summary>{plans}</details>' if plans else ''}</td></tr>"
+            )
+        return (
+            f"<h4>Profile of {html.escape(self.notebook.name)}</h4><table>"
+            "<tr><th>cell</th><th>status</th><th>wall s</th><th>time by library</th>"
+            "<th>hottest functions</th><th>query plans</th></tr>"
+            + "".join(rows) + "</table>"
+        )
+
+
+def profile_notebook(path: Path | str) -> NotebookProfile:
+    """Run the notebook at ``path`` with every cell profiled."""
+    path = Path(path).resolve()
+    profiles: dict[int, CellProfile] = {}
+
+    def wrap(cell: runner.Cell, run: Callable[[], None]) -> None:
+        profile = profiles[cell.index] = CellProfile(cell)
+        collected: list[pl.LazyFrame] = []
+        try:
+            with _capture_collects(collected), _StackSampler(profile, str(path)):
+                run()
+        finally:
+            profile.plans.extend(_explain(frame) for frame in collected)
+
+    reports = runner.run_notebook(path, wrap=wrap)
+    cells = []
+    for report in reports:
+        profile = profiles.get(report.index) or CellProfile(
+            next(c for c in runner.parse_notebook(path) if c.index == report.index)
+        )
+        profile.report = report
+        cells.append(profile)
+    return NotebookProfile(path, cells)
+
+
+def _library(stack: tuple[Frame, ...]) -> str:
+    for _, file, _ in reversed(stack):
+        package = Path(file).as_posix().rpartition("site-packages/")[2].split("/", 1)[0]
+        if package in LIBRARIES:
+            return package
+    return "other"
+
+
+@contextlib.contextmanager
+def _capture_collects(frames: list[pl.LazyFrame]) -> Iterator[None]:
+    """Keep every LazyFrame collected inside the block, except Polars' own."""
+    collect, collect_all = pl.LazyFrame.collect, pl.collect_all
+
+    def recording_collect(self, *args, **kwargs):
+        if not _called_by_polars(kwargs):
+            frames.append(self)
+        return collect(self, *args, **kwargs)
+
+    def recording_collect_all(lazy_frames, *args, **kwargs):
+        if not _called_by_polars(kwargs):
+            lazy_frames = list(lazy_frames)
+            frames.extend(lazy_frames)
+        return collect_all(lazy_frames, *args, **kwargs)
+
+    pl.LazyFrame.collect, pl.collect_all = recording_collect, recording_collect_all
+    try:
+        yield
+    finally:
+        pl.LazyFrame.collect, pl.collect_all = collect, collect_all
+
+
+def _called_by_polars(kwargs: dict) -> bool:
+    """Whether a collect comes from inside Polars, such as ``DataFrame.group_by``.
+
+    Eager ``DataFrame`` methods run through ``lazy().collect()`` with the
+    eager optimization flags; the caller's module catches any that do not.
+    """
+    flags = kwargs.get("optimizations")
+    if flags is not None and getattr(flags._pyoptflags, "eager", False):
+        return True
+    caller = sys._getframe(2).f_globals.get("__name__", "")
+    return caller == "polars" or caller.startswith("polars.")
+
+
+def _explain(frame: pl.LazyFrame) -> str:
+    try:
+        return frame.explain()
+    except pl.exceptions.PolarsError as e:
+        # e.g. a scanned file the cell has since removed
+        return f"Could not explain the plan: {e}"
+
+
+class _StackSampler:
+    """Sample the calling thread's stack from the cell's code downwards."""
+
+    def __init__(self, profile: CellProfile, notebook_file: str):
+        self.profile = profile
+        self.notebook_file = notebook_file
+
+    def __enter__(self) -> "_StackSampler":
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._sampler.join()
+
+    def _sample(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self._thread_id)
+            now = time.perf_counter()
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            stack.reverse()
+            # Drop the runner and profiler frames below the cell itself
+            start = next((i for i, f in enumerate(stack) if f[1] == self.notebook_file), None)
+            if start is not None:
+                self.profile.stacks.append(tuple(stack[start:]))
+                self.profile.weights.append(now - last)
+            last = now
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile every cell of a marimo notebook.")
+    parser.add_argument("notebook", type=Path)
+    parser.add_argument("--speedscope", type=Path, help="write a speedscope profile here")
+    args = parser.parse_args()
+
+    profile = profile_notebook(args.notebook)
+    for cell in sorted(profile.cells, key=lambda c: c.report.wall_seconds, reverse=True)[:10]:
+        libraries = ", ".join(f"{k} {v:.3f}s" for k, v in cell.time_by_library().items())
+        print(f"{cell.cell.label:<22} {cell.report.wall_seconds:>8.3f}s  {libraries}")
+    if args.speedscope:
+        profile.save_speedscope(args.speedscope)
+        print(f"\nWrote {args.speedscope}; open it at https://www.speedscope.app")
+
+
+if __name__ == "__main__":
+    main()
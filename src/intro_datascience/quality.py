@@ -0,0 +1,199 @@
+"""Declarative data-quality rules, checked in one pass over the data.
+
+The sales data has deliberate problems (see ``data/README.md``). Looking for
+them one at a time with ``null_count()``, ``n_unique()`` and filters reads
+the data once per question. A ``Rule`` instead describes one check as an
+expression that flags the rows failing it, and ``validate`` evaluates every
+rule in the same query::
+
+    from intro_datascience import datasets, quality
+
+    result = quality.validate(datasets.sales(), quality.SALES_RULES)
+    result.report       # one row per rule: how many rows fail it
+    result.quarantine   # the failing rows, with the rules each one broke
+    result.to_dict()    # the report as plain data, e.g. for JSON
+
+The report and the quarantine are collected together, so Polars scans the
+source and computes the rule flags once for both.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import polars as pl
+
+KINDS = ("not_null", "range", "product", "pattern", "consistent_case")
+
+_FLAG = "__failed__"
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A check that every row should pass.
+
+    ``kind`` is one of ``KINDS``:
+
+    - ``not_null``: ``column`` has a value
+    - ``range``: ``low <= column <= high`` (either bound may be left out)
+    - ``product``: ``column`` is within ``tolerance`` of the product of
+      ``factors``, e.g. a total and its quantity times unit price
+    - ``pattern``: ``column`` matches the regular expression ``pattern``
+    - ``consistent_case``: ``column`` is spelled like the most common of the
+      values that differ from it only in case and surrounding spaces (when
+      spellings tie for most common, all of them pass)
+
+    Apart from ``not_null``, a null value passes: nulls are a separate rule.
+    """
+
+    name: str
+    kind: str
+    column: str
+    low: float | None = None
+    high: float | None = None
+    factors: tuple[str, ...] = ()
+    tolerance: float = 0.01
+    pattern: str | None = None
+
+    def __post_init__(self):
+        if self.kind not in KINDS:
+            raise ValueError(f"Unknown rule kind {self.kind!r}, expected one of {KINDS}")
+        if self.kind == "range" and self.low is None and self.high is None:
+            raise ValueError(f"Range rule {self.name!r} needs a low or high bound")
+        if self.kind == "product" and not self.factors:
+            raise ValueError(f"Product rule {self.name!r} needs factors")
+        if self.kind == "pattern" and not self.pattern:
+            raise ValueError(f"Pattern rule {self.name!r} needs a pattern")
+
+    def failed(self) -> pl.Expr:
+        """True for the rows that fail this rule."""
+        col = pl.col(self.column)
+        if self.kind == "not_null":
+            return col.is_null()
+        if self.kind == "range":
+            inside = pl.lit(True)
+            if self.low is not None:
+                inside &= col >= self.low
+            if self.high is not None:
+                inside &= col <= self.high
+            failed = ~inside
+        elif self.kind == "product":
+            product = pl.lit(1.0)
+            for factor in self.factors:
+                product *= pl.col(factor)
+            failed = (col - product).abs() > self.tolerance
+        elif self.kind == "pattern":
+            failed = ~col.cast(pl.String).str.contains(self.pattern)
+        else:
+            spelling_rows = col.len().over(col)
+            failed = spelling_rows < spelling_rows.max().over(_folded(col.cast(pl.String)))
+        return failed.fill_null(False)
+
+
+# The documented quality issues in the sales data, plus the id formats
+SALES_RULES = (
+    *(
+        Rule(f"{column}_not_null", "not_null", column)
+        for column in (
+            "transaction_id", "date", "customer_id", "product_category", "quantity",
+            "unit_price", "total_amount", "payment_method", "region",
+        )
+    ),
+    Rule("quantity_positive", "range", "quantity", low=1),
+    Rule("unit_price_positive", "range", "unit_price", low=0.01),
+    Rule("total_amount_positive", "range", "total_amount", low=0.01),
+    Rule("total_is_quantity_times_price", "product", "total_amount",
+         factors=("quantity", "unit_price"), tolerance=0.01),
+    Rule("transaction_id_format", "pattern", "transaction_id", pattern=r"^TXN\d{4,}$"),
+    Rule("customer_id_format", "pattern", "customer_id", pattern=r"^CUST\d{3,}$"),
+    # The loaders respell payment methods and regions to their Enum labels,
+    # so only the categories can be spelled inconsistently
+    Rule("product_category_case", "consistent_case", "product_category"),
+)
+
+
+@dataclass
+class ValidationResult:
+    report: pl.DataFrame
+    quarantine: pl.DataFrame
+
+    @property
+    def passed(self) -> bool:
+        return self.report["failed"].sum() == 0
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": int(self.report["rows"][0]) if self.report.height else 0,
+            "quarantined": self.quarantine.height,
+            "passed": self.passed,
+            "rules": self.report.drop("rows").to_dicts(),
+        }
+
+
+def validate(frame: pl.DataFrame | pl.LazyFrame, rules: Sequence[Rule]) -> ValidationResult:
+    """Check ``frame`` against ``rules`` in one pass.
+
+    ``report`` has one row per rule with the number and share of rows that
+    fail it. For ``consistent_case`` rules it also has the number of distinct
+    values before and after folding case. ``quarantine`` holds every row that
+    fails at least one rule, with the names of those rules in ``failed_rules``.
+    """
+    names = [rule.name for rule in rules]
+    if len(set(names)) != len(names):
+        raise ValueError("Rule names must be unique")
+    flagged = frame.lazy().with_columns(
+        rule.failed().alias(_FLAG + rule.name) for rule in rules
+    )
+    flags = [_FLAG + rule.name for rule in rules]
+
+    counts = flagged.select(
+        pl.len().alias("rows"),
+        *(pl.col(flag).sum().alias(flag) for flag in flags),
+        *(
+            expr
+            for rule in rules
+            if rule.kind == "consistent_case"
+            for expr in (
+                pl.col(rule.column).n_unique().alias(f"{rule.name}__distinct"),
+                _folded(pl.col(rule.column).cast(pl.String))
+                .n_unique()
+                .alias(f"{rule.name}__distinct_normalized"),
+            )
+        ),
+    )
+    quarantine = flagged.filter(pl.any_horizontal(flags)).select(
+        pl.all().exclude(flags),
+        pl.concat_list(
+            pl.when(pl.col(flag)).then(pl.lit(rule.name)) for flag, rule in zip(flags, rules)
+        )
+        .list.drop_nulls()
+        .alias("failed_rules"),
+    )
+    totals, quarantined = pl.collect_all([counts, quarantine])
+
+    total = totals.row(0, named=True)
+    rows = total["rows"]
+    report = pl.DataFrame(
+        [
+            {
+                "rule": rule.name,
+                "kind": rule.kind,
+                "column": rule.column,
+                "rows": rows,
+                "failed": total[_FLAG + rule.name],
+                "failed_share": total[_FLAG + rule.name] / rows if rows else 0.0,
+                "distinct": total.get(f"{rule.name}__distinct"),
+                "distinct_normalized": total.get(f"{rule.name}__distinct_normalized"),
+            }
+            for rule in rules
+        ],
+        schema={
+            "rule": pl.String, "kind": pl.String, "column": pl.String, "rows": pl.UInt32,
+            "failed": pl.UInt32, "failed_share": pl.Float64, "distinct": pl.UInt32,
+            "distinct_normalized": pl.UInt32,
+        },
+    )
+    return ValidationResult(report, quarantined)
+
+
+def _folded(text: pl.Expr) -> pl.Expr:
+    return text.str.strip_chars().str.to_lowercase()
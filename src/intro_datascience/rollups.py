@@ -0,0 +1,187 @@
+"""Named sales aggregates, computed once and shared between notebooks.
+
+The same group-bys (revenue by category, region, payment method and month)
+appear in several notebooks and figures. ``rollup(name)`` computes one of them
+the first time it is asked for, saves the result as Parquet in
+``data/processed/rollups`` and serves the saved copy afterwards::
+
+    from intro_datascience import rollups
+
+    category_sales = rollups.rollup("category_sales")
+    dashboard = rollups.rollup_all(["monthly_sales", "region_sales"])
+
+Rollups that are not saved yet are computed together as grouping sets, so
+asking for several of them scans the sales data only once.
+
+A saved rollup is keyed on the sales query plan, which names the versioned
+Parquet copy of the sales data (see ``cache``), plus the rollup definition.
+Changing either gives a new key and a fresh result. For a folder of sales
+parts the key also covers the parts' sizes and modification times.
+
+When new transactions arrive as separate batches, ``append_sales`` folds each
+batch into saved partial state instead (see ``incremental``), and
+``incremental_rollup`` reads the up-to-date result without rescanning the
+history. Batches first go through the transaction store (see
+``transactions``), so a transaction exported twice is only counted once and
+a corrected one replaces its earlier version in the totals.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import polars as pl
+
+from intro_datascience import cache, customers, datasets, schemas, transactions
+from intro_datascience.grouping import Measure, grouping_sets
+from intro_datascience.incremental import AggregateState, update_all
+
+
+@dataclass(frozen=True)
+class RollupSpec:
+    """Sales grouped by ``by`` with ``measures``, sorted by the ``sort`` column(s)."""
+
+    by: tuple[str, ...]
+    measures: tuple[Measure, ...]
+    sort: str | tuple[str, ...]
+    descending: bool = False
+
+
+TRANSACTIONS = Measure("transaction_count", "count")
+REVENUE = Measure("total_revenue", "sum", "total_amount")
+AVG_TRANSACTION = Measure("avg_transaction", "mean", "total_amount")
+QUANTITY = Measure("total_quantity", "sum", "quantity")
+
+ROLLUPS: dict[str, RollupSpec] = {
+    "category_sales": RollupSpec(
+        ("product_category",),
+        (TRANSACTIONS, REVENUE, AVG_TRANSACTION, QUANTITY),
+        sort="total_revenue",
+        descending=True,
+    ),
+    "region_sales": RollupSpec(("region",), (TRANSACTIONS, REVENUE), sort="region"),
+    "payment_sales": RollupSpec(
+        ("payment_method",), (TRANSACTIONS, REVENUE, AVG_TRANSACTION), sort="payment_method"
+    ),
+    # Keyed on the year too, so batches from a later year never add into an
+    # earlier year's month
+    "monthly_sales": RollupSpec(
+        ("year", "month"), (TRANSACTIONS, REVENUE), sort=("year", "month")
+    ),
+}
+
+# Results already loaded in this process, by key
+_loaded: dict[str, pl.DataFrame] = {}
+
+
+def rollup(name: str, raw_dir: Path | None = None) -> pl.DataFrame:
+    """Return the rollup called ``name``, computing and saving it if needed."""
+    return rollup_all([name], raw_dir)[name]
+
+
+def rollup_all(
+    names: Iterable[str] | None = None, raw_dir: Path | None = None
+) -> dict[str, pl.DataFrame]:
+    """Return several rollups (all of them by default) by name.
+
+    Any that are not saved yet are computed from a single scan of the sales.
+    """
+    names = list(ROLLUPS if names is None else names)
+    unknown = sorted(set(names) - set(ROLLUPS))
+    if unknown:
+        raise KeyError(f"Unknown rollups {unknown}, expected names from {sorted(ROLLUPS)}")
+
+    sales = datasets.with_calendar(datasets.sales(raw_dir))
+    version = datasets.sales_version(raw_dir)
+    keys = {
+        name: hashlib.sha256(f"{version}{ROLLUPS[name]!r}".encode()).hexdigest()[:16]
+        for name in names
+    }
+    store = rollup_dir(raw_dir)
+
+    results = {}
+    for name in names:
+        path = store / f"{name}-{keys[name]}.parquet"
+        if keys[name] not in _loaded and path.exists():
+            _loaded[keys[name]] = pl.read_parquet(path)
+        if keys[name] in _loaded:
+            results[name] = _loaded[keys[name]]
+
+    missing = [name for name in names if name not in results]
+    if missing:
+        for name, result in _compute(sales, missing).items():
+            _save(result, store, name, keys[name])
+            _loaded[keys[name]] = results[name] = result
+    return {name: results[name] for name in names}
+
+
+def rollup_dir(raw_dir: Path | None = None) -> Path:
+    """Where saved rollups live: ``data/processed/rollups``."""
+    return datasets.processed_dir(raw_dir) / "rollups"
+
+
+def clear(raw_dir: Path | None = None) -> None:
+    """Delete every saved rollup, so the next request computes it again."""
+    for path in rollup_dir(raw_dir).glob("*.parquet"):
+        path.unlink()
+    _loaded.clear()
+
+
+def incremental_states(raw_dir: Path | None = None) -> dict[str, AggregateState]:
+    """The saved incremental state of every rollup, by name."""
+    state_dir = rollup_dir(raw_dir) / "incremental"
+    return {
+        name: AggregateState(state_dir / f"{name}.parquet", spec.by, spec.measures)
+        for name, spec in ROLLUPS.items()
+    }
+
+
+def append_sales(
+    batch: pl.DataFrame | pl.LazyFrame, raw_dir: Path | None = None
+) -> transactions.UpsertResult:
+    """Fold a batch of sales transactions into every incremental rollup.
+
+    ``batch`` has the raw sales columns; it is typed with ``schemas.SALES``
+    like a loaded dataset and upserted into the transaction store. Only new
+    transactions are added to the rollups; for a changed one the stored
+    version is taken out and the new one added. The customer table (see
+    ``customers``) is refreshed the same way. Start from an empty state by
+    appending the full history once, then append each batch as it arrives.
+    """
+    typed = schemas.apply(batch.lazy(), schemas.SALES)
+    result = transactions.sales_store(raw_dir).upsert(typed)
+    replaced = datasets.with_calendar(result.replaced.lazy()) if result.replaced.height else None
+    update_all(
+        incremental_states(raw_dir), datasets.with_calendar(result.added.lazy()), retract=replaced
+    )
+    customers.update(result, raw_dir)
+    return result
+
+
+def incremental_rollup(name: str, raw_dir: Path | None = None) -> pl.DataFrame:
+    """The rollup called ``name`` over every batch passed to ``append_sales``."""
+    spec = ROLLUPS[name]
+    result = incremental_states(raw_dir)[name].result()
+    return result.sort(spec.sort, descending=spec.descending)
+
+
+def _compute(sales: pl.LazyFrame, names: list[str]) -> dict[str, pl.DataFrame]:
+    measures = list(dict.fromkeys(m for name in names for m in ROLLUPS[name].measures))
+    views = grouping_sets(sales, {name: ROLLUPS[name].by for name in names}, measures)
+    results = {}
+    for name, view in views.items():
+        spec = ROLLUPS[name]
+        results[name] = view.select(*spec.by, *(m.alias for m in spec.measures)).sort(
+            spec.sort, descending=spec.descending
+        )
+    return results
+
+
+def _save(result: pl.DataFrame, store: Path, name: str, key: str) -> None:
+    path = store / f"{name}-{key}.parquet"
+    cache.write_atomic(path, result.write_parquet)
+    # Older versions of this rollup can no longer be served
+    for old in store.glob(f"{name}-*.parquet"):
+        if old != path:
+            old.unlink(missing_ok=True)
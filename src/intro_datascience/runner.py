@@ -0,0 +1,298 @@
+"""Run a marimo notebook headlessly and time every cell.
+
+``app.run()`` executes a notebook but says nothing about where the time
+goes. This runner reads the notebook file itself: each ``@app.cell``
+function's parameters are the names it uses and its ``return`` lists the
+names it defines, which gives the same dependency graph marimo uses. Cells
+run in dependency order; a cell whose inputs failed is skipped. For every
+cell it records:
+
+- wall time and CPU time (CPU time includes Polars' worker threads)
+- peak memory: the highest resident set size sampled while the cell ran,
+  minus the size just before it, so memory allocated by Polars counts too
+- output size: bytes of the cell's displayed value and of what it printed
+
+Run it from anywhere; cells execute with the notebook's folder as the
+working directory, as in the marimo editor::
+
+    uv run python -m intro_datascience.runner example_notebooks/02_data_wrangling.py
+    uv run python -m intro_datascience.runner exercises/ex02_wrangle.py --json report.json
+"""
+
+import argparse
+import ast
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+OUTPUT_NAME = "__cell_output__"
+
+# Called as wrap(cell, run) and must call run() once, returning its result
+CellWrapper = Callable[["Cell", Callable[[], None]], None]
+
+
+@dataclass
+class Cell:
+    """One ``@app.cell`` function from a notebook file."""
+
+    index: int
+    line: int
+    refs: list[str]
+    defs: list[str]
+    code: Any = field(repr=False)
+
+    @property
+    def label(self) -> str:
+        return f"cell {self.index} (line {self.line})"
+
+
+@dataclass
+class CellReport:
+    index: int
+    line: int
+    status: str  # "ok", "error" or "skipped"
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_memory_delta_bytes: int = 0
+    output_bytes: int = 0
+    stdout_bytes: int = 0
+    error: str | None = None
+
+
+def parse_notebook(path: Path) -> list[Cell]:
+    """Read the cells of a marimo notebook without importing it."""
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    cells = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and any(_is_app_cell(d) for d in node.decorator_list):
+            cells.append(_compile_cell(node, len(cells), path))
+    return cells
+
+
+def execution_order(cells: list[Cell]) -> list[Cell]:
+    """Order cells so each runs after the cells defining the names it uses."""
+    definer = {name: cell.index for cell in cells for name in cell.defs}
+    order: list[Cell] = []
+    state: dict[int, str] = {}
+
+    def visit(cell: Cell) -> None:
+        if state.get(cell.index) == "done":
+            return
+        if state.get(cell.index) == "visiting":
+            raise ValueError(f"Cycle in notebook cells at {cell.label}")
+        state[cell.index] = "visiting"
+        for ref in cell.refs:
+            if ref in definer:
+                visit(cells[definer[ref]])
+        state[cell.index] = "done"
+        order.append(cell)
+
+    for cell in cells:
+        visit(cell)
+    return order
+
+
+def run_notebook(path: Path, wrap: CellWrapper | None = None) -> list[CellReport]:
+    """Execute every cell of the notebook at ``path`` and report on each."""
+    path = path.resolve()
+    cells = parse_notebook(path)
+    namespace: dict[str, Any] = {"__name__": "__notebook__", "__file__": str(path)}
+    failed: set[str] = set()
+    reports = []
+
+    with _working_directory(path.parent):
+        for cell in execution_order(cells):
+            if failed & set(cell.refs):
+                reports.append(CellReport(cell.index, cell.line, "skipped"))
+                failed.update(cell.defs)
+                continue
+            report = _run_cell(cell, namespace, wrap)
+            if report.status == "error":
+                failed.update(cell.defs)
+            reports.append(report)
+    return reports
+
+
+def _run_cell(cell: Cell, namespace: dict[str, Any], wrap: CellWrapper | None) -> CellReport:
+    stdout = io.StringIO()
+    namespace.pop(OUTPUT_NAME, None)
+
+    def run() -> None:
+        with contextlib.redirect_stdout(stdout):
+            exec(cell.code, namespace)
+
+    error = None
+    with _PeakMemory() as memory:
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            wrap(cell, run) if wrap else run()
+        except Exception:
+            error = traceback.format_exc()
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+    return CellReport(
+        index=cell.index,
+        line=cell.line,
+        status="error" if error else "ok",
+        wall_seconds=wall,
+        cpu_seconds=cpu,
+        peak_memory_delta_bytes=memory.peak_delta,
+        output_bytes=output_size(namespace.get(OUTPUT_NAME)),
+        stdout_bytes=len(stdout.getvalue().encode()),
+        error=error,
+    )
+
+
+def output_size(value: Any) -> int:
+    """Approximate bytes needed to display ``value``."""
+    if value is None:
+        return 0
+    if hasattr(value, "estimated_size"):  # Polars DataFrame
+        return int(value.estimated_size())
+    if hasattr(value, "to_json"):  # Plotly figure
+        return len(value.to_json().encode())
+    if hasattr(value, "text"):  # marimo Html, such as mo.md
+        return len(str(value.text).encode())
+    return len(repr(value).encode())
+
+
+def _is_app_cell(decorator: ast.expr) -> bool:
+    if isinstance(decorator, ast.Call):
+        decorator = decorator.func
+    return (
+        isinstance(decorator, ast.Attribute)
+        and decorator.attr == "cell"
+        and isinstance(decorator.value, ast.Name)
+        and decorator.value.id == "app"
+    )
+
+
+def _compile_cell(node: ast.FunctionDef, index: int, path: Path) -> Cell:
+    """Turn a cell function's body into module code run in a shared namespace.
+
+    The ``return`` is dropped and a final bare expression, which marimo would
+    display, is assigned to ``OUTPUT_NAME`` instead.
+    """
+    body = list(node.body)
+    defs: list[str] = []
+    if body and isinstance(body[-1], ast.Return):
+        returned = body.pop().value
+        if isinstance(returned, ast.Tuple):
+            defs = [e.id for e in returned.elts if isinstance(e, ast.Name)]
+        elif isinstance(returned, ast.Name):
+            defs = [returned.id]
+    if body and isinstance(body[-1], ast.Expr):
+        last = body[-1]
+        body[-1] = ast.copy_location(
+            ast.Assign(targets=[ast.Name(OUTPUT_NAME, ast.Store())], value=last.value), last
+        )
+    if not body:
+        body = [ast.copy_location(ast.Pass(), node)]
+    module = ast.fix_missing_locations(ast.Module(body=body, type_ignores=[]))
+    return Cell(
+        index=index,
+        line=node.lineno,
+        refs=[arg.arg for arg in node.args.args],
+        defs=defs,
+        code=compile(module, str(path), "exec"),
+    )
+
+
+@contextlib.contextmanager
+def _working_directory(directory: Path) -> Iterator[None]:
+    previous = Path.cwd()
+    os.chdir(directory)
+    sys.path.insert(0, str(directory))
+    try:
+        yield
+    finally:
+        sys.path.remove(str(directory))
+        os.chdir(previous)
+
+
+def _rss_bytes() -> int:
+    """Current resident set size, or the peak so far where that is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _PeakMemory:
+    """Sample RSS in a background thread and keep the peak above the start."""
+
+    interval = 0.005
+
+    def __enter__(self) -> "_PeakMemory":
+        self.start = self.peak = _rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_bytes())
+
+    @property
+    def peak_delta(self) -> int:
+        return max(0, self.peak - self.start)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _rss_bytes())
+
+
+def format_report(reports: list[CellReport]) -> str:
+    """A plain-text table of the reports, slowest cell first."""
+    lines = [
+        f"{'cell':>4} {'line':>5} {'status':<8} {'wall s':>8} {'cpu s':>8} "
+        f"{'peak MB':>8} {'output KB':>10}"
+    ]
+    for r in sorted(reports, key=lambda r: r.wall_seconds, reverse=True):
+        lines.append(
+            f"{r.index:>4} {r.line:>5} {r.status:<8} {r.wall_seconds:>8.3f} {r.cpu_seconds:>8.3f} "
+            f"{r.peak_memory_delta_bytes / 2**20:>8.1f} {r.output_bytes / 1024:>10.1f}"
+        )
+    total = sum(r.wall_seconds for r in reports)
+    lines.append(f"{len(reports)} cells, {total:.3f} s total")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a marimo notebook and time each cell.")
+    parser.add_argument("notebook", type=Path)
+    parser.add_argument("--json", type=Path, help="also write the report as JSON")
+    args = parser.parse_args()
+
+    reports = run_notebook(args.notebook)
+    print(format_report(reports))
+    for r in reports:
+        if r.error:
+            print(f"\nError in cell {r.index} (line {r.line}):\n{r.error}", file=sys.stderr)
+    if args.json:
+        payload = {"notebook": str(args.notebook), "cells": [asdict(r) for r in reports]}
+        args.json.write_text(json.dumps(payload, indent=2))
+    if any(r.status != "ok" for r in reports):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
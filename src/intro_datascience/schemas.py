@@ -0,0 +1,107 @@
+"""Column types for the course datasets.
+
+Without a schema Polars infers every text column as ``String`` and leaves the
+dates as text. These schemas are applied when a dataset is loaded:
+
+- columns with a small, fixed set of values are ``pl.Enum`` (stored as small
+  integer codes plus one copy of each label); raw text is matched to the
+  labels ignoring case and spaces, so "north " loads as "North"
+- ``product_category`` is ``pl.Categorical`` because its raw values have mixed
+  capitalisation, so the set of labels is not fixed
+- dates are ``pl.Date``
+- ids and counts use the narrowest integer type that fits them
+
+The column lists match ``data/README.md``.
+"""
+
+import hashlib
+
+import polars as pl
+
+REGIONS = pl.Enum(["North", "South", "East", "West", "Central"])
+PAYMENT_METHODS = pl.Enum(["Credit Card", "Debit Card", "PayPal", "Cash"])
+SUBJECTS = pl.Enum(["Mathematics", "Science", "English", "Art"])
+WEATHER_CONDITIONS = pl.Enum(["Sunny", "Partly Cloudy", "Cloudy", "Overcast", "Rainy"])
+
+STUDENTS = pl.Schema({
+    "student_id": pl.UInt32,
+    "name": pl.String,
+    "age": pl.UInt8,
+    "grade_level": pl.UInt8,
+    "subject": SUBJECTS,
+    "test_score": pl.Float64,
+    "attendance_rate": pl.Float64,
+    "enrollment_date": pl.Date,
+})
+
+SALES = pl.Schema({
+    "transaction_id": pl.String,
+    "date": pl.Date,
+    "customer_id": pl.String,
+    "product_category": pl.Categorical(),
+    "product_name": pl.String,
+    # Signed: raw exports can contain invalid, non-positive quantities
+    "quantity": pl.Int16,
+    "unit_price": pl.Float64,
+    "total_amount": pl.Float64,
+    "payment_method": PAYMENT_METHODS,
+    "region": REGIONS,
+})
+
+WEATHER = pl.Schema({
+    "date": pl.Date,
+    "temperature_high": pl.Float64,
+    "temperature_low": pl.Float64,
+    "precipitation": pl.Float64,
+    "humidity": pl.UInt8,
+    "wind_speed": pl.Float64,
+    "condition": WEATHER_CONDITIONS,
+})
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def apply(frame: pl.LazyFrame, schema: pl.Schema) -> pl.LazyFrame:
+    """Cast the columns of ``frame`` to ``schema``.
+
+    Casts are strict: a value that does not fit (an unknown region, a quantity
+    too big for ``Int16``, a malformed date) raises when the frame is collected
+    instead of silently becoming null. Text cast to an ``Enum`` is first
+    respelled as the label it matches ignoring case and repeated or
+    surrounding spaces. Columns not in ``schema`` are left as-is.
+    """
+    current = frame.collect_schema()
+    casts = []
+    for name, dtype in schema.items():
+        if name not in current or current[name] == dtype:
+            continue
+        if dtype == pl.Date and current[name] == pl.String:
+            casts.append(pl.col(name).str.to_date(DATE_FORMAT))
+        elif isinstance(dtype, pl.Enum) and current[name] in (pl.String, pl.Categorical):
+            casts.append(_respelled(pl.col(name), dtype))
+        else:
+            casts.append(pl.col(name).cast(dtype))
+    return frame.with_columns(casts) if casts else frame
+
+
+def _respelled(column: pl.Expr, dtype: pl.Enum) -> pl.Expr:
+    """``column`` as ``dtype``, matching its text to the labels like ``cleaning`` does."""
+    labels = {label.lower(): label for label in dtype.categories}
+    folded = column.cast(pl.String).str.replace_all(r"\s+", " ").str.strip_chars()
+    # Text matching no label still raises, as a plain cast would
+    return folded.str.to_lowercase().replace_strict(labels, return_dtype=dtype)
+
+
+def hashable(frame: pl.DataFrame) -> pl.DataFrame:
+    """``frame`` with its Categorical and Enum columns as text, ready for ``hash_rows``.
+
+    ``hash_rows`` hashes a Categorical by its physical code, which depends on
+    the order categories were first seen in the process, so the same row can
+    hash differently from one session (or batch) to the next.
+    """
+    return frame.with_columns(pl.col(pl.Categorical, pl.Enum).cast(pl.String))
+
+
+def fingerprint(schema: pl.Schema) -> str:
+    """A short hash that changes whenever ``schema`` does, for cache keys."""
+    return hashlib.sha256(repr(list(schema.items())).encode()).hexdigest()[:16]
@@ -0,0 +1,241 @@
+"""Seeded synthetic versions of the course datasets, at any size.
+
+The bundled data is tiny. This module generates ``students``, ``sales`` and
+``weather`` with the same columns, types and deliberate quality issues as
+``data/README.md`` describes, and writes them as numbered Parquet parts::
+
+    out/
+    ├── students/part-00000.parquet ...
+    ├── sales/part-00000.parquet ...
+    └── weather/part-00000.parquet ...
+
+Only one chunk of rows is in memory at a time, so 1B-row datasets can be
+written on an ordinary machine. A dataset's parts are written to a
+temporary folder that replaces the old one once they are all written, so
+no parts of an earlier run mix into the new dataset. Each chunk has its own random stream derived
+from the seed, so the same seed, sizes and ``chunk_rows`` always produce the
+same files. ``datasets`` reads a directory laid out like this in place of
+``data/raw``::
+
+    uv run python -m intro_datascience.synthetic data/synthetic --sales-rows 10000000
+
+    datasets.sales(raw_dir=Path("data/synthetic"))
+"""
+
+import argparse
+import shutil
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+from intro_datascience import cache, schemas
+
+PRODUCTS = {
+    "Electronics": ["Laptop", "Phone", "Tablet", "Headphones", "Camera"],
+    "Clothing": ["T-Shirt", "Jeans", "Jacket", "Shoes", "Hat"],
+    "Home & Garden": ["Lamp", "Cushion", "Plant", "Tool Set", "Paint"],
+    "Books": ["Fiction", "Non-Fiction", "Textbook", "Comic", "Magazine"],
+    "Sports": ["Ball", "Racket", "Yoga Mat", "Dumbbells", "Bike"],
+}
+FIRST_NAMES = ["Emma", "Liam", "Olivia", "Noah", "Ava", "Ethan", "Sophia", "Mason",
+               "Isabella", "William", "Mia", "James", "Charlotte", "Lucas", "Amelia"]
+LAST_NAMES = ["Johnson", "Smith", "Brown", "Davis", "Wilson", "Moore", "Taylor", "Anderson",
+              "Thomas", "Jackson", "White", "Harris", "Martin", "Garcia", "Martinez"]
+
+# Shares of rows carrying each deliberate quality issue
+LOWERCASE_CATEGORY_RATE = 0.05
+BAD_QUANTITY_RATE = 0.005
+NULL_RATE = 0.01
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+_DATASET_IDS = {"students": 0, "sales": 1, "weather": 2}
+
+
+def generate_students(
+    out_dir: Path, rows: int, seed: int = 0, chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> None:
+    """Write ``rows`` students to ``out_dir / "students"``."""
+    directory = _new_folder(out_dir / "students")
+    for index, start, n in _chunks(rows, chunk_rows):
+        rng = _rng(seed, "students", index)
+        first = _pick(rng, FIRST_NAMES, n)
+        last = _pick(rng, LAST_NAMES, n)
+        enrolled = _days_after(date(2023, 9, 1), rng.integers(0, 30, n))
+        frame = pl.select(
+            student_id=pl.int_range(start + 1, start + n + 1, dtype=pl.UInt32),
+            name=first + " " + last,
+            age=pl.Series(rng.integers(13, 19, n)),
+            grade_level=pl.Series(rng.integers(8, 13, n)),
+            subject=_pick(rng, schemas.SUBJECTS.categories, n),
+            test_score=_with_nulls(rng, pl.Series(rng.normal(80, 9, n).clip(0, 100).round(1))),
+            attendance_rate=pl.Series(rng.uniform(70, 100, n).round(1)),
+            enrollment_date=enrolled,
+        )
+        _write(frame, schemas.STUDENTS, directory, index)
+    _replace_folder(directory)
+
+
+def generate_sales(
+    out_dir: Path,
+    rows: int,
+    seed: int = 0,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    start: date = date(2024, 1, 1),
+    days: int = 365,
+) -> None:
+    """Write ``rows`` sales transactions to ``out_dir / "sales"``.
+
+    Transaction dates are spread uniformly over ``days`` days from ``start``.
+    """
+    customers = max(200, rows // 50)
+    categories = list(PRODUCTS)
+    directory = _new_folder(out_dir / "sales")
+    for index, first_row, n in _chunks(rows, chunk_rows):
+        rng = _rng(seed, "sales", index)
+        category_index = rng.integers(0, len(categories), n)
+        product_index = rng.integers(0, 5, n)
+        products = pl.Series([p for c in categories for p in PRODUCTS[c]])
+        category = pl.Series(categories).gather(category_index)
+        lowercase = pl.Series(rng.random(n) < LOWERCASE_CATEGORY_RATE)
+
+        quantity = rng.integers(1, 6, n)
+        bad = rng.random(n) < BAD_QUANTITY_RATE
+        quantity[bad] = rng.integers(-1, 1, bad.sum())
+        unit_price = rng.uniform(10, 500, n).round(2)
+
+        frame = pl.select(
+            transaction_id="TXN" + _padded(pl.int_range(first_row + 1, first_row + n + 1), 4),
+            date=_days_after(start, rng.integers(0, days, n)),
+            customer_id="CUST" + _padded(pl.Series(rng.integers(1, customers + 1, n)), 3),
+            product_category=pl.when(lowercase)
+            .then(category.str.to_lowercase())
+            .otherwise(category),
+            product_name=products.gather(category_index * 5 + product_index),
+            quantity=pl.Series(quantity),
+            unit_price=pl.Series(unit_price),
+            total_amount=pl.Series((quantity * unit_price).round(2)),
+            payment_method=_with_nulls(rng, _pick(rng, schemas.PAYMENT_METHODS.categories, n)),
+            region=_pick(rng, schemas.REGIONS.categories, n),
+        )
+        _write(frame, schemas.SALES, directory, index)
+    _replace_folder(directory)
+
+
+def generate_weather(
+    out_dir: Path,
+    stations: int,
+    days: int = 365,
+    seed: int = 0,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    start: date = date(2024, 1, 1),
+) -> None:
+    """Write ``days`` daily observations for each of ``stations`` stations.
+
+    Rows are ordered by station, then date, and carry an extra ``station_id``
+    column. Each station has its own climate offset on a shared seasonal cycle.
+    """
+    stations_per_chunk = max(1, chunk_rows // days)
+    directory = _new_folder(out_dir / "weather")
+    for index, first_station, n_stations in _chunks(stations, stations_per_chunk):
+        rng = _rng(seed, "weather", index)
+        n = n_stations * days
+        day = np.tile(np.arange(days), n_stations)
+        offset = np.repeat(rng.normal(0, 4, n_stations), days)
+        seasonal = 23 + 6 * np.cos(2 * np.pi * (day - 15) / 365.25)
+        high = seasonal + offset + rng.normal(0, 3, n)
+        low = high - rng.uniform(5, 14, n)
+        humidity = rng.integers(30, 91, n)
+        rainy = rng.random(n) < (humidity - 30) / 80
+        precipitation = np.where(rainy, rng.exponential(15, n).clip(0, 80), 0).round(1)
+        condition = np.where(
+            precipitation > 0,
+            "Rainy",
+            np.array(["Sunny", "Partly Cloudy", "Cloudy", "Overcast"])[
+                np.minimum((humidity - 30) // 15, 3)
+            ],
+        )
+        station_ids = np.arange(first_station, first_station + n_stations)
+        frame = pl.select(
+            station_id=pl.Series(np.repeat(station_ids, days), dtype=pl.UInt32),
+            date=_days_after(start, day),
+            temperature_high=pl.Series(high.round(1)),
+            temperature_low=pl.Series(low.round(1)),
+            precipitation=pl.Series(precipitation),
+            humidity=pl.Series(humidity),
+            wind_speed=pl.Series(rng.uniform(0, 40, n).round(1)),
+            condition=pl.Series(condition),
+        )
+        _write(frame, schemas.WEATHER, directory, index)
+    _replace_folder(directory)
+
+
+def _chunks(total: int, size: int):
+    """Yield ``(index, start, length)`` for consecutive chunks of ``total``."""
+    for index, start in enumerate(range(0, total, size)):
+        yield index, start, min(size, total - start)
+
+
+def _rng(seed: int, dataset: str, chunk: int) -> np.random.Generator:
+    return np.random.default_rng([seed, _DATASET_IDS[dataset], chunk])
+
+
+def _pick(rng: np.random.Generator, values, n: int) -> pl.Series:
+    values = pl.Series(values)
+    return values.gather(rng.integers(0, len(values), n))
+
+
+def _with_nulls(rng: np.random.Generator, values: pl.Series) -> pl.Series:
+    return values.scatter(np.flatnonzero(rng.random(len(values)) < NULL_RATE), None)
+
+
+def _padded(numbers: pl.Expr | pl.Series, width: int) -> pl.Expr | pl.Series:
+    return numbers.cast(pl.String).str.zfill(width)
+
+
+def _days_after(start: date, days: np.ndarray) -> pl.Expr:
+    return pl.lit(start) + pl.duration(days=pl.Series(days))
+
+
+def _new_folder(directory: Path) -> Path:
+    """An empty temporary folder to write ``directory``'s parts into."""
+    tmp_directory = directory.with_name(directory.name + ".tmp")
+    shutil.rmtree(tmp_directory, ignore_errors=True)
+    tmp_directory.mkdir(parents=True)
+    return tmp_directory
+
+
+def _replace_folder(tmp_directory: Path) -> None:
+    """Move a folder from ``_new_folder`` into place, replacing any earlier run."""
+    cache.replace_directory(tmp_directory, tmp_directory.with_suffix(""))
+
+
+def _write(frame: pl.DataFrame, schema: pl.Schema, directory: Path, index: int) -> None:
+    typed = schemas.apply(frame.lazy(), schema).collect()
+    typed.write_parquet(directory / f"part-{index:05d}.parquet")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic course datasets.")
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--students-rows", type=int, default=0)
+    parser.add_argument("--sales-rows", type=int, default=0)
+    parser.add_argument("--weather-stations", type=int, default=0)
+    parser.add_argument("--weather-days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    if args.students_rows:
+        generate_students(args.out_dir, args.students_rows, args.seed, args.chunk_rows)
+    if args.sales_rows:
+        generate_sales(args.out_dir, args.sales_rows, args.seed, args.chunk_rows)
+    if args.weather_stations:
+        generate_weather(
+            args.out_dir, args.weather_stations, args.weather_days, args.seed, args.chunk_rows
+        )
+
+
+if __name__ == "__main__":
+    main()
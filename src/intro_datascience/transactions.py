@@ -0,0 +1,282 @@
+"""A deduplicated store of sales transactions, keyed on ``transaction_id``.
+
+Exports overlap: the same transaction can arrive in several batches, and a
+corrected transaction arrives again with different values. ``upsert`` sorts
+each incoming row into one of three kinds before anything is written:
+
+- ``new``: the id has not been seen
+- ``duplicate``: the id is stored with exactly the same values; skipped
+- ``changed``: the id is stored with other values; the new version replaces it
+
+The decision uses an index of ``transaction_id`` and a hash of each stored
+row, never the stored transactions themselves. The index is a list of
+append-only segments, each sorted by a hash of the id and memory-mapped when
+read, so looking up a batch is a binary search per segment that touches only
+the entries it needs. Each upsert adds one segment for its new and changed
+rows; when the newest segment grows to half the size of the one before, the
+two are merged. That keeps the number of segments logarithmic in the number
+of ids, and each id is only rewritten a logarithmic number of times, so an
+upsert costs time in proportion to its batch rather than the history::
+
+    from intro_datascience import transactions
+
+    store = transactions.sales_store()
+    result = store.upsert(batch)
+    result.new, result.changed, result.duplicates
+    store.scan()  # the current version of every transaction
+
+The store lives in ``data/processed/transactions``::
+
+    transactions/
+    ├── _store.json                   batches, index segments, columns, Polars version
+    ├── data/part-00000.parquet       rows added by each upsert, with a _batch column
+    └── index/segment-00000.arrow     transaction_id, id and row hashes, _batch
+
+Row hashes come from ``DataFrame.hash_rows`` over the values as text, which
+can change between Polars versions, so the index is rebuilt when the version
+in ``_store.json`` differs from the running one.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import polars as pl
+
+from intro_datascience import cache, datasets, schemas
+
+_BATCH = "_batch"
+_HASH = "_row_hash"
+_KEY_HASH = "_key_hash"
+
+# Bumped whenever the way rows are hashed or indexed changes, so older indexes are rebuilt
+_HASHING = 3
+
+
+@dataclass
+class UpsertResult:
+    new: pl.DataFrame
+    changed: pl.DataFrame  # the new versions
+    replaced: pl.DataFrame  # the versions they replace
+    duplicates: int
+
+    @property
+    def added(self) -> pl.DataFrame:
+        """Every row written by the upsert: new rows and new versions."""
+        return pl.concat([self.new, self.changed])
+
+    def __str__(self) -> str:
+        return (
+            f"{self.new.height} new, {self.changed.height} changed, "
+            f"{self.duplicates} duplicate"
+        )
+
+
+@dataclass(frozen=True)
+class TransactionStore:
+    """Records keyed on ``key``, saved under ``root``."""
+
+    root: Path
+    key: str = "transaction_id"
+
+    def exists(self) -> bool:
+        return (self.root / "_store.json").exists()
+
+    def scan(self) -> pl.LazyFrame:
+        """The current version of every stored record."""
+        if not self.exists():
+            raise FileNotFoundError(f"No transaction store at {self.root}, call upsert() first")
+        segments = self._manifest()["segments"]
+        current = (
+            pl.scan_ipc([self._segment_path(s["name"]) for s in segments])
+            .group_by(self.key)
+            .agg(pl.col(_BATCH).max())
+        )
+        return (
+            pl.scan_parquet(self.root / "data" / "*.parquet")
+            .join(current, on=[self.key, _BATCH], how="semi")
+            .drop(_BATCH)
+        )
+
+    def classify(self, batch: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame:
+        """``batch`` with a ``status`` column: ``new``, ``duplicate`` or ``changed``.
+
+        A repeated id within the batch counts once, as its last occurrence;
+        the earlier occurrences are duplicates.
+        """
+        self._check_index_version()
+        hashed = self._hashed(batch.lazy().collect())
+        index = self._lookup(hashed, self._manifest()["segments"])
+        return self._classify(hashed, index).drop(_HASH, _KEY_HASH)
+
+    def upsert(self, batch: pl.DataFrame | pl.LazyFrame) -> UpsertResult:
+        """Store the new and changed rows of ``batch`` and report what it held."""
+        self._check_index_version()
+        manifest = self._manifest()
+        number = manifest["batches"]
+        hashed = self._hashed(batch.lazy().collect())
+        index = self._lookup(hashed, manifest["segments"])
+        classified = self._classify(hashed, index)
+
+        added = classified.filter(pl.col("status") != "duplicate")
+        changed_ids = added.filter(pl.col("status") == "changed").select(self.key)
+        replaced = self._read_versions(index.join(changed_ids, on=self.key, how="semi"))
+
+        if added.height:
+            # Keep the first batch's column order so the parts scan together
+            columns = manifest.get("columns") or [
+                c for c in hashed.columns if c not in (_HASH, _KEY_HASH)
+            ]
+            batch_number = pl.lit(number, pl.UInt32).alias(_BATCH)
+            records = added.select(*columns, batch_number)
+            cache.write_atomic(
+                self.root / "data" / f"part-{number:05d}.parquet", records.write_parquet
+            )
+            entries = added.select(self.key, _HASH, _KEY_HASH, batch_number)
+            segment = self._write_segment(entries, number, number)
+            segments = self._compact([*manifest["segments"], segment])
+            manifest = {
+                **manifest, "batches": number + 1, "segments": segments, "columns": columns
+            }
+            self._write_manifest(manifest)
+            self._remove_unlisted_segments(segments)
+
+        def rows(status: str) -> pl.DataFrame:
+            return added.filter(pl.col("status") == status).drop("status", _HASH, _KEY_HASH)
+
+        return UpsertResult(
+            new=rows("new"),
+            changed=rows("changed"),
+            replaced=replaced,
+            duplicates=hashed.height - added.height,
+        )
+
+    def _hashed(self, frame: pl.DataFrame) -> pl.DataFrame:
+        # Hash the columns in name order so a reordered export hashes the same,
+        # and categories as text so the hash does not depend on Categorical codes
+        values = schemas.hashable(frame.select(sorted(frame.columns)))
+        return frame.with_columns(
+            values.hash_rows(seed=0).alias(_HASH),
+            pl.col(self.key).hash(seed=0).alias(_KEY_HASH),
+        )
+
+    def _classify(self, hashed: pl.DataFrame, index: pl.DataFrame) -> pl.DataFrame:
+        stored = index.select(self.key, pl.col(_HASH).alias("_stored_hash"))
+        return hashed.join(stored, on=self.key, how="left", maintain_order="left").with_columns(
+            # Only the last copy of an id within the batch counts
+            pl.when(~pl.col(self.key).is_last_distinct()).then(pl.lit("duplicate"))
+            .when(pl.col("_stored_hash").is_null()).then(pl.lit("new"))
+            .when(pl.col("_stored_hash") == pl.col(_HASH)).then(pl.lit("duplicate"))
+            .otherwise(pl.lit("changed"))
+            .alias("status")
+        ).drop("_stored_hash")
+
+    def _lookup(self, hashed: pl.DataFrame, segments: list[dict]) -> pl.DataFrame:
+        """The latest index entry for each id in ``hashed`` that is stored."""
+        wanted = hashed.select(self.key, _KEY_HASH).unique()
+        key_hashes = wanted[_KEY_HASH].sort()
+        found = [
+            pl.DataFrame(schema={self.key: hashed.schema[self.key], _HASH: pl.UInt64,
+                                 _KEY_HASH: pl.UInt64, _BATCH: pl.UInt32})
+        ]
+        for segment in segments:
+            entries = pl.read_ipc(self._segment_path(segment["name"]), memory_map=True)
+            # Binary search for each wanted hash; equal hashes sit next to each other
+            bounds = pl.DataFrame({
+                "start": entries[_KEY_HASH].search_sorted(key_hashes, side="left"),
+                "end": entries[_KEY_HASH].search_sorted(key_hashes, side="right"),
+            })
+            positions = bounds.select(pl.int_ranges("start", "end").explode().drop_nulls())
+            found.append(entries[positions.to_series()])
+        return (
+            pl.concat(found, how="vertical_relaxed")
+            .join(wanted.select(self.key), on=self.key, how="semi")
+            .sort(_BATCH)
+            .unique(self.key, keep="last")
+        )
+
+    def _write_segment(self, entries: pl.DataFrame, first: int, last: int) -> dict:
+        """Save index ``entries`` from batches ``first`` to ``last`` as a segment.
+
+        The entries are sorted by id hash. Returns the segment's manifest entry.
+        """
+        name = f"segment-{first:05d}.arrow" if first == last else (
+            f"segment-{first:05d}-{last:05d}.arrow"
+        )
+        path = self._segment_path(name)
+        # Uncompressed, so the segment can be memory-mapped and searched in place
+        sorted_entries = entries.sort(_KEY_HASH)
+        cache.write_atomic(path, lambda p: sorted_entries.write_ipc(p, compression="uncompressed"))
+        return {"name": name, "rows": entries.height, "first": first, "last": last}
+
+    def _compact(self, segments: list[dict]) -> list[dict]:
+        """Merge the newest segments while the last is at least half the one before."""
+        segments = list(segments)
+        while len(segments) > 1 and 2 * segments[-1]["rows"] >= segments[-2]["rows"]:
+            older, newer = segments[-2], segments[-1]
+            merged = (
+                pl.concat([pl.read_ipc(self._segment_path(s["name"])) for s in (older, newer)])
+                .sort(_BATCH)
+                .unique(self.key, keep="last")
+            )
+            segments[-2:] = [self._write_segment(merged, older["first"], newer["last"])]
+        return segments
+
+    def _remove_unlisted_segments(self, segments: list[dict]) -> None:
+        """Delete segments merged away, once the manifest no longer lists them."""
+        listed = {s["name"] for s in segments}
+        for path in (self.root / "index").glob("*.arrow"):
+            if path.name not in listed:
+                path.unlink()
+
+    def _read_versions(self, entries: pl.DataFrame) -> pl.DataFrame:
+        """The stored records named by index ``entries``, from the parts holding them."""
+        if not entries.height:
+            return pl.DataFrame()
+        paths = [self.root / "data" / f"part-{b:05d}.parquet" for b in entries[_BATCH].unique()]
+        return (
+            pl.scan_parquet(paths)
+            .join(entries.lazy().select(self.key, _BATCH), on=[self.key, _BATCH], how="semi")
+            .drop(_BATCH)
+            .collect()
+        )
+
+    def _segment_path(self, name: str) -> Path:
+        return self.root / "index" / name
+
+    def _check_index_version(self) -> None:
+        """Rebuild the index if its hashes came from another Polars version or scheme."""
+        if not self.exists():
+            return
+        manifest = self._manifest()
+        if manifest["polars"] == pl.__version__ and manifest.get("hashing") == _HASHING:
+            return
+        # The current version of each id is the one from its latest batch
+        current = (
+            pl.scan_parquet(self.root / "data" / "*.parquet")
+            .filter(pl.col(_BATCH) == pl.col(_BATCH).max().over(self.key))
+            .collect()
+        )
+        entries = self._hashed(current.drop(_BATCH)).select(
+            self.key, _HASH, _KEY_HASH, current[_BATCH]
+        )
+        segments = [self._write_segment(entries, 0, manifest["batches"] - 1)]
+        self._write_manifest({
+            **manifest, "segments": segments, "polars": pl.__version__, "hashing": _HASHING
+        })
+        self._remove_unlisted_segments(segments)
+
+    def _manifest(self) -> dict:
+        path = self.root / "_store.json"
+        if not path.exists():
+            return {"batches": 0, "segments": [], "polars": pl.__version__, "hashing": _HASHING}
+        return json.loads(path.read_text())
+
+    def _write_manifest(self, manifest: dict) -> None:
+        text = json.dumps(manifest, indent=2)
+        cache.write_atomic(self.root / "_store.json", lambda p: p.write_text(text))
+
+
+def sales_store(raw_dir: Path | None = None) -> TransactionStore:
+    """The transaction store for the sales in ``raw_dir``."""
+    return TransactionStore(datasets.processed_dir(raw_dir) / "transactions")
@@ -0,0 +1,129 @@
+"""Rolling and calendar-window statistics for the weather series.
+
+Monthly means from ``dt.month()`` and ``group_by`` cover one question.
+Monitoring weather usually needs a few more, all per station:
+
+- ``rolling``: 7- and 30-day rolling mean temperatures and precipitation
+  totals, one row per station-day
+- ``calendar``: means and totals per calendar week, month or year
+- ``degree_days``: heating and cooling degree-days, from the daily mean
+  temperature
+- ``year_over_year``: the change from the same date a year earlier
+
+::
+
+    from intro_datascience import datasets, windows
+
+    daily = windows.rolling(datasets.weather())
+    monthly = windows.year_over_year(windows.calendar(datasets.weather()), ["mean_high"])
+
+Everything is a lazy query over whole columns, with no Python loop over
+stations. Windows are measured in time on the ``date`` column, so a missing
+day shortens a window instead of stretching it over an extra row. Data with
+a ``station_id`` column (like the ``synthetic`` weather) is sorted by station
+and date once, and every window stays within its station; data without one
+is treated as a single station.
+"""
+
+from collections.abc import Sequence
+
+import polars as pl
+
+STATION = "station_id"
+WINDOWS = ("7d", "30d")
+
+# Degree-days count how far the daily mean is below (heating) or above
+# (cooling) this temperature, in °C
+BASE_TEMPERATURE = 18.0
+
+
+def degree_days(base: float = BASE_TEMPERATURE) -> list[pl.Expr]:
+    """``heating_degree_days`` and ``cooling_degree_days`` for each day's row."""
+    mean = (pl.col("temperature_high") + pl.col("temperature_low")) / 2
+    return [
+        (base - mean).clip(lower_bound=0).alias("heating_degree_days"),
+        (mean - base).clip(lower_bound=0).alias("cooling_degree_days"),
+    ]
+
+
+def rolling(
+    weather: pl.DataFrame | pl.LazyFrame,
+    windows: Sequence[str] = WINDOWS,
+    base: float = BASE_TEMPERATURE,
+) -> pl.LazyFrame:
+    """Each station-day with rolling statistics over the trailing ``windows``.
+
+    For a window such as ``"7d"`` this adds ``temperature_high_mean_7d``,
+    ``temperature_low_mean_7d`` and ``precipitation_sum_7d``, plus the day's
+    degree-days. A window ends on, and includes, its row's date.
+    """
+    weather, by = _sorted(weather)
+    rolled = [
+        # One pass per window length; on sorted input, rolling keeps the row order
+        weather.rolling("date", period=window, group_by=by or None)
+        .agg(
+            pl.col("temperature_high").mean().alias(f"temperature_high_mean_{window}"),
+            pl.col("temperature_low").mean().alias(f"temperature_low_mean_{window}"),
+            pl.col("precipitation").sum().alias(f"precipitation_sum_{window}"),
+        )
+        .drop(*by, "date")
+        for window in windows
+    ]
+    return pl.concat([weather, *rolled], how="horizontal").with_columns(degree_days(base))
+
+
+def calendar(
+    weather: pl.DataFrame | pl.LazyFrame, every: str = "1mo", base: float = BASE_TEMPERATURE
+) -> pl.LazyFrame:
+    """Statistics per station and calendar window of length ``every``.
+
+    ``every`` is a Polars duration such as ``"1w"``, ``"1mo"`` or ``"1y"``;
+    windows start on Mondays, on the first of the month or on 1 January, and
+    ``date`` holds the start. Each row has the number of days observed, the
+    mean high and low, total precipitation and total degree-days.
+    """
+    weather, by = _sorted(weather)
+    return weather.with_columns(degree_days(base)).group_by_dynamic(
+        "date", every=every, group_by=by, start_by="window"
+    ).agg(
+        pl.len().alias("days"),
+        pl.col("temperature_high").mean().alias("mean_high"),
+        pl.col("temperature_low").mean().alias("mean_low"),
+        pl.col("precipitation").sum().alias("total_precipitation"),
+        pl.col("heating_degree_days").sum(),
+        pl.col("cooling_degree_days").sum(),
+    )
+
+
+def year_over_year(
+    frame: pl.DataFrame | pl.LazyFrame, columns: Sequence[str]
+) -> pl.LazyFrame:
+    """``frame`` with ``{column}_yoy``: the change since the same date a year earlier.
+
+    Rows are matched on ``date`` minus one year (29 February matches 28
+    February), within each station. Works on daily rows and on ``calendar``
+    rows by month or year; a row with nothing a year earlier gets null.
+    """
+    frame = frame.lazy()
+    by = [STATION] if STATION in frame.collect_schema() else []
+    earlier = frame.select(
+        *by,
+        pl.col("date").alias("_year_earlier"),
+        *(pl.col(column).alias(f"_{column}_year_earlier") for column in columns),
+    )
+    return (
+        frame.with_columns(pl.col("date").dt.offset_by("-1y").alias("_year_earlier"))
+        .join(earlier, on=[*by, "_year_earlier"], how="left", maintain_order="left")
+        .with_columns(
+            (pl.col(column) - pl.col(f"_{column}_year_earlier")).alias(f"{column}_yoy")
+            for column in columns
+        )
+        .drop("_year_earlier", *(f"_{column}_year_earlier" for column in columns))
+    )
+
+
+def _sorted(weather: pl.DataFrame | pl.LazyFrame) -> tuple[pl.LazyFrame, list[str]]:
+    """``weather`` sorted by station (when there is one) and date, and the station key."""
+    weather = weather.lazy()
+    by = [STATION] if STATION in weather.collect_schema() else []
+    return weather.sort(*by, "date"), by
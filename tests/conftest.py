@@ -0,0 +1,21 @@
+import shutil
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from intro_datascience import datasets
+
+
+@pytest.fixture
+def raw_dir(tmp_path: Path) -> Path:
+    """A copy of the course data, so derived files land in ``tmp_path/processed``."""
+    for path in datasets.RAW_DIR.iterdir():
+        shutil.copy(path, tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def sales_rows() -> pl.DataFrame:
+    """The raw sales transactions, untyped, as they arrive in an export."""
+    return pl.read_json(datasets.RAW_DIR / "sales.json")
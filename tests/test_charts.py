@@ -0,0 +1,87 @@
+import numpy as np
+import plotly.express as px
+import polars as pl
+import pytest
+import statsmodels.api as sm
+
+from intro_datascience import charts
+
+
+def test_box_whiskers_stop_at_tukey_fences_and_outliers_are_drawn():
+    frame = pl.DataFrame({"score": [1.0, 2, 3, 4, 5, 6, 7, 8, 9, 100, -80, None]})
+    fig = charts.histogram(frame, "score", box=True)
+    box, points = fig.data[0], fig.data[1]
+    assert (box.lowerfence, box.upperfence) == ((1.0,), (9.0,))
+    assert sorted(points.x) == [-80.0, 100.0]
+
+
+def test_box_without_outliers_reaches_the_extremes():
+    whiskers, outliers = charts.box_stats(pl.DataFrame({"x": [1.0, 2.0, 3.0, 4.0]}), "x")
+    assert whiskers == {"lowerfence": 1.0, "upperfence": 4.0}
+    assert outliers.is_empty()
+
+
+def test_scatter_switches_to_webgl_where_plotly_does():
+    for rows in (1_000, 1_001, 5_000):
+        frame = pl.DataFrame({"x": range(rows), "y": range(rows)})
+        expected = px.scatter(frame, x="x", y="y").data[0].type
+        assert charts.scatter(frame, "x", "y").data[0].type == expected
+
+
+def walks(rows: int) -> pl.DataFrame:
+    """A random walk of ``rows`` steps for each of two stations."""
+    rng = np.random.default_rng(0)
+    return pl.DataFrame({
+        "station": np.repeat(["a", "b"], rows),
+        "step": np.tile(np.arange(rows), 2),
+        "value": rng.normal(size=2 * rows).cumsum(),
+    })
+
+
+def test_decimate_keeps_ends_and_extremes_of_each_group():
+    frame = walks(20_000)
+    for method in ("lttb", "minmax"):
+        line = charts.decimate(frame, "step", "value", 100, by="station", method=method)
+        for (station,), group in line.group_by("station"):
+            full = frame.filter(pl.col("station") == station)
+            assert group.height <= 100
+            assert group["step"].is_sorted()
+            assert group["value"].min() == full["value"].min()
+            assert group["value"].max() == full["value"].max()
+            if method == "lttb":
+                assert group.row(0) == full.row(0)
+                assert group.row(-1) == full.row(-1)
+
+
+def test_decimate_reads_a_narrow_window_at_full_detail():
+    frame = walks(20_000)
+    window = charts.decimate(frame, "step", "value", 100, by="station", start=500, end=549)
+    expected = frame.filter(pl.col("step").is_between(500, 549)).sort("station", "step")
+    assert window.equals(expected)
+
+
+def test_ols_fits_and_band_match_statsmodels():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 100, 400)
+    frame = pl.DataFrame({
+        "group": np.repeat(["a", "b"], 200),
+        "x": x,
+        "y": np.where(np.arange(400) < 200, 2.0, -0.5) * x + rng.normal(0, 10, 400),
+    })
+    fits = charts.ols_fits(frame, "x", "y", by="group")
+    bands = charts.trendline_band(fits, by="group", level=0.95, points=7)
+
+    for fit in fits.iter_rows(named=True):
+        rows = frame.filter(pl.col("group") == fit["group"])
+        model = sm.OLS(rows["y"].to_numpy(), sm.add_constant(rows["x"].to_numpy())).fit()
+        assert fit["intercept"] == pytest.approx(model.params[0])
+        assert fit["slope"] == pytest.approx(model.params[1])
+        assert fit["r2"] == pytest.approx(model.rsquared)
+
+        band = bands.filter(pl.col("group") == fit["group"])
+        expected = model.get_prediction(sm.add_constant(band["x"].to_numpy())).summary_frame(
+            alpha=0.05
+        )
+        assert band["fitted"].to_numpy() == pytest.approx(expected["mean"].to_numpy())
+        assert band["lower"].to_numpy() == pytest.approx(expected["mean_ci_lower"].to_numpy())
+        assert band["upper"].to_numpy() == pytest.approx(expected["mean_ci_upper"].to_numpy())
@@ -0,0 +1,32 @@
+import polars as pl
+
+from intro_datascience import customers, rollups
+
+
+def test_table_is_rebuilt_when_the_sales_change(raw_dir, sales_rows):
+    customer = sales_rows["customer_id"][0]
+    before = customers.lookup(customer, raw_dir)
+
+    sales_rows.filter(pl.col("customer_id") != customer).write_json(raw_dir / "sales.json")
+    assert customers.lookup(customer, raw_dir).is_empty()
+    assert not before.is_empty()
+
+
+def test_appended_batches_match_a_full_build(raw_dir, sales_rows):
+    rollups.append_sales(sales_rows.head(300), raw_dir)
+    rollups.append_sales(sales_rows.slice(250), raw_dir)
+    appended = customers.table(raw_dir)
+    assert appended.equals(customers.build(raw_dir))
+    assert appended["customer_id"].is_sorted()
+
+
+def test_lookups_match_filtering_the_table(raw_dir):
+    table = customers.table(raw_dir)
+    ids = table["customer_id"]
+    few = [ids[3], "CUST-missing", ids[0]]
+    many = ids.gather_every(5).to_list() + ["CUST-missing"]
+
+    assert customers.lookup(few, raw_dir).equals(table.filter(pl.col("customer_id").is_in(few)))
+    assert customers.lookup(many, raw_dir).equals(table.filter(pl.col("customer_id").is_in(many)))
+    assert customers.between(ids[2], ids[6], raw_dir).equals(table.slice(2, 5))
+    assert customers.between(ids[6], ids[2], raw_dir).is_empty()
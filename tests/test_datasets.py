@@ -0,0 +1,44 @@
+import os
+
+import polars as pl
+
+from intro_datascience import cache, datasets
+
+
+def newer_than(path, other):
+    """Give ``path`` a modification time after ``other``'s."""
+    mtime = other.stat().st_mtime_ns + 10**9
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_arrow_copy_is_used_until_the_csv_content_changes(raw_dir):
+    (raw_dir / "weather.parquet").unlink()
+    csv = raw_dir / "weather.csv"
+    datasets.weather(raw_dir).collect().write_ipc(raw_dir / "weather.arrow")
+    newer_than(raw_dir / "weather.arrow", csv)
+    assert datasets.open_weather(raw_dir)[1].format == "ipc"
+
+    # Touching the CSV without changing it keeps the copy
+    newer_than(csv, raw_dir / "weather.arrow")
+    assert datasets.open_weather(raw_dir)[1].format == "ipc"
+
+    edited = pl.read_csv(csv).with_columns(pl.col("temperature_high") + 1)
+    edited.write_csv(csv)
+    frame, report = datasets.open_weather(raw_dir)
+    assert report.source.parent == datasets.processed_dir(raw_dir)
+    assert frame.collect()["temperature_high"].equals(edited["temperature_high"])
+
+
+def test_cached_copy_is_rebuilt_only_when_the_source_changes(raw_dir):
+    source = raw_dir / "sales.json"
+    first = cache.cached_parquet(source, pl.read_json, datasets.processed_dir(raw_dir))
+    written = first.stat().st_mtime_ns
+
+    os.utime(source)
+    assert cache.cached_parquet(source, pl.read_json, datasets.processed_dir(raw_dir)) == first
+    assert first.stat().st_mtime_ns == written
+
+    pl.read_json(source).head(10).write_json(source)
+    second = cache.cached_parquet(source, pl.read_json, datasets.processed_dir(raw_dir))
+    assert second != first and not first.exists()
+    assert pl.read_parquet(second).height == 10
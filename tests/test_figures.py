@@ -0,0 +1,39 @@
+import polars as pl
+
+from intro_datascience import charts, figures
+
+
+def test_lazy_frame_key_follows_the_data_not_the_path(tmp_path):
+    path = tmp_path / "weather.parquet"
+    pl.DataFrame({"temperature_high": [20.0, 21.0]}).write_parquet(path)
+    before = figures.figure_key(charts.histogram, pl.scan_parquet(path), "temperature_high")
+
+    pl.DataFrame({"temperature_high": [20.0, 25.0]}).write_parquet(path)
+    after = figures.figure_key(charts.histogram, pl.scan_parquet(path), "temperature_high")
+    assert before != after
+
+
+
+def test_lazy_frame_key_notices_a_new_part_in_a_folder(tmp_path):
+    parts = tmp_path / "weather"
+    parts.mkdir()
+    for index in range(3):
+        pl.DataFrame({"temperature_high": [20.0 + index]}).write_parquet(
+            parts / f"part-{index:05d}.parquet"
+        )
+    before = figures.figure_key(charts.histogram, pl.scan_parquet(parts / "*.parquet"), "x")
+
+    pl.DataFrame({"temperature_high": [30.0]}).write_parquet(parts / "part-00003.parquet")
+    after = figures.figure_key(charts.histogram, pl.scan_parquet(parts / "*.parquet"), "x")
+    assert before != after
+
+
+def test_lazy_frame_over_memory_is_keyed_by_its_data():
+    first = pl.DataFrame({"x": [1.0, 2.0]}).lazy()
+    second = pl.DataFrame({"x": [1.0, 3.0]}).lazy()
+    assert figures.figure_key(charts.histogram, first, "x") == figures.figure_key(
+        charts.histogram, pl.DataFrame({"x": [1.0, 2.0]}).lazy(), "x"
+    )
+    assert figures.figure_key(charts.histogram, first, "x") != figures.figure_key(
+        charts.histogram, second, "x"
+    )
@@ -0,0 +1,64 @@
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from intro_datascience import rollups
+
+
+def corrected(rows: pl.DataFrame, transaction_id: str, amount: float) -> pl.DataFrame:
+    """``rows`` with the total of ``transaction_id`` set to ``amount``."""
+    return rows.with_columns(
+        pl.when(pl.col("transaction_id") == transaction_id)
+        .then(amount)
+        .otherwise(pl.col("total_amount"))
+        .alias("total_amount")
+    )
+
+
+def test_changed_row_is_retracted_and_added_again(raw_dir, sales_rows):
+    rollups.append_sales(sales_rows, raw_dir)
+    before = rollups.incremental_rollup("region_sales", raw_dir)
+
+    row = sales_rows.filter(pl.col("transaction_id") == "TXN0260")
+    fixed = corrected(row, "TXN0260", row["total_amount"].item() + 100)
+    result = rollups.append_sales(fixed, raw_dir)
+    assert (result.new.height, result.changed.height) == (0, 1)
+
+    after = rollups.incremental_rollup("region_sales", raw_dir)
+    assert after.schema == before.schema
+    assert after["transaction_count"].to_list() == before["transaction_count"].to_list()
+    change = after["total_revenue"] - before["total_revenue"]
+    region = after["region"].cast(pl.String)
+    assert change.filter(region == row["region"].item()).item() == pytest.approx(100)
+    assert change.filter(region != row["region"].item()).abs().max() < 1e-6
+
+
+def test_incremental_totals_equal_a_full_rollup(raw_dir, sales_rows):
+    # Overlapping batches, then a correction to one already stored transaction
+    rollups.append_sales(sales_rows.head(300), raw_dir)
+    rollups.append_sales(sales_rows.slice(250), raw_dir)
+    final = corrected(sales_rows, "TXN0042", 12.5)
+    rollups.append_sales(final.filter(pl.col("transaction_id") == "TXN0042"), raw_dir)
+
+    # The full rollup rescans the sales file, so give it the corrected history
+    final.write_json(raw_dir / "sales.json")
+    for name in rollups.ROLLUPS:
+        assert_frame_equal(
+            rollups.incremental_rollup(name, raw_dir),
+            rollups.rollup(name, raw_dir),
+            check_exact=False,
+        )
+
+
+def test_monthly_totals_keep_years_apart(raw_dir, sales_rows):
+    january = sales_rows.filter(pl.col("date").str.starts_with("2024-01"))
+    next_year = january.with_columns(
+        ("N" + pl.col("transaction_id")).alias("transaction_id"),
+        pl.col("date").str.replace("^2024", "2025"),
+    )
+    rollups.append_sales(january, raw_dir)
+    rollups.append_sales(next_year, raw_dir)
+
+    monthly = rollups.incremental_rollup("monthly_sales", raw_dir)
+    assert monthly.select("year", "month").rows() == [(2024, 1), (2025, 1)]
+    assert monthly["transaction_count"].to_list() == [january.height] * 2
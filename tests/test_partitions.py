@@ -0,0 +1,36 @@
+from datetime import date
+
+import polars as pl
+
+from intro_datascience import cleaning, datasets, partitions
+
+
+def test_month_range_reads_only_its_rows(raw_dir):
+    march = partitions.sales(raw_dir, start=date(2024, 3, 1), end=date(2024, 3, 31)).collect()
+    expected = cleaning.clean_sales(datasets.sales(raw_dir)).filter(
+        pl.col("date").is_between(date(2024, 3, 1), date(2024, 3, 31))
+    ).collect()
+    assert march.height == expected.height > 0
+    assert set(march["month"]) == {3}
+    assert set(march["transaction_id"]) == set(expected["transaction_id"])
+
+
+def test_folders_are_rewritten_when_the_sales_change(raw_dir, sales_rows):
+    before = partitions.sales(raw_dir).collect()
+    sales_rows.filter(pl.col("date") < "2024-07-01").write_json(raw_dir / "sales.json")
+    after = partitions.sales(raw_dir).collect()
+    assert 0 < after.height < before.height
+    assert after["date"].max() < date(2024, 7, 1)
+    assert max(partitions.months(partitions.sales_root(raw_dir))) < (2024, 7)
+
+
+def test_write_replaces_a_leftover_old_folder(tmp_path, sales_rows):
+    root = tmp_path / "sales"
+    frame = sales_rows.with_columns(pl.col("date").str.to_date())
+    partitions.write(frame, root)
+    # An interrupted earlier write left its moved-aside folder behind
+    (tmp_path / "sales.old" / "year=2020").mkdir(parents=True)
+
+    partitions.write(frame.head(10), root)
+    assert partitions.scan(root).collect().height == 10
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["sales"]
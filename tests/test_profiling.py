@@ -0,0 +1,16 @@
+import polars as pl
+
+from intro_datascience import profiling
+
+
+def test_only_lazy_collects_by_the_caller_are_recorded():
+    frame = pl.DataFrame({"region": ["North", "South", "North"], "amount": [1.0, 2.0, 3.0]})
+    collected = []
+    with profiling._capture_collects(collected):
+        frame.group_by("region").agg(pl.col("amount").sum())
+        frame.sort("amount").filter(pl.col("amount") > 1)
+        query = frame.lazy().group_by("region").agg(pl.col("amount").sum())
+        query.collect()
+        pl.collect_all([query, frame.lazy().head(1)])
+    assert len(collected) == 3
+    assert pl.LazyFrame.collect.__name__ == "collect"
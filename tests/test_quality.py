@@ -0,0 +1,20 @@
+import polars as pl
+
+from intro_datascience import datasets, quality
+
+
+def test_sales_rules_flag_the_miscased_categories(raw_dir, sales_rows):
+    result = quality.validate(datasets.sales(raw_dir), quality.SALES_RULES)
+    miscased = sales_rows.filter(
+        pl.col("product_category") != pl.col("product_category").str.to_titlecase()
+    )
+    failed = dict(zip(result.report["rule"], result.report["failed"]))
+    assert failed["product_category_case"] == miscased.height > 0
+    assert set(result.quarantine["transaction_id"]) >= set(miscased["transaction_id"])
+
+
+def test_case_rules_only_check_columns_loaded_as_text(raw_dir):
+    schema = datasets.sales(raw_dir).collect_schema()
+    for rule in quality.SALES_RULES:
+        if rule.kind == "consistent_case":
+            assert not isinstance(schema[rule.column], pl.Enum), rule.name
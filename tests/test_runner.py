@@ -0,0 +1,84 @@
+import textwrap
+
+import pytest
+
+from intro_datascience import runner
+
+# Cells declared out of order: the first uses names the later cells define
+NOTEBOOK = textwrap.dedent('''
+    import marimo
+
+    app = marimo.App()
+
+
+    @app.cell
+    def _(doubled, total):
+        print(doubled, total)
+        total + 1
+        return
+
+
+    @app.cell
+    def _(numbers):
+        total = sum(numbers)
+        return (total,)
+
+
+    @app.cell
+    def _():
+        numbers = [1, 2, 3]
+        return (numbers,)
+
+
+    @app.cell
+    def _(numbers):
+        doubled = [n / 0 for n in numbers]
+        return (doubled,)
+
+
+    @app.cell
+    def _(doubled):
+        halved = [n / 2 for n in doubled]
+        return (halved,)
+
+
+    if __name__ == "__main__":
+        app.run()
+''')
+
+
+@pytest.fixture
+def notebook(tmp_path):
+    path = tmp_path / "notebook.py"
+    path.write_text(NOTEBOOK)
+    return path
+
+
+def test_cells_run_after_the_cells_they_use(notebook):
+    cells = runner.parse_notebook(notebook)
+    assert [(cell.refs, cell.defs) for cell in cells] == [
+        (["doubled", "total"], []),
+        (["numbers"], ["total"]),
+        ([], ["numbers"]),
+        (["numbers"], ["doubled"]),
+        (["doubled"], ["halved"]),
+    ]
+    assert [cell.index for cell in runner.execution_order(cells)] == [2, 3, 1, 0, 4]
+
+
+def test_cells_after_a_failure_are_skipped(notebook):
+    reports = {report.index: report for report in runner.run_notebook(notebook)}
+    assert {i: r.status for i, r in reports.items()} == {
+        0: "skipped", 1: "ok", 2: "ok", 3: "error", 4: "skipped"
+    }
+    assert "ZeroDivisionError" in reports[3].error
+
+
+def test_last_expression_is_measured_as_output(notebook):
+    notebook.write_text(NOTEBOOK.replace("n / 0", "n * 2"))
+    reports = {report.index: report for report in runner.run_notebook(notebook)}
+    assert all(report.status == "ok" for report in reports.values())
+    # The first cell displays total + 1 == 7 and prints "[2, 4, 6] 6\n"
+    assert reports[0].output_bytes == len(repr(7))
+    assert reports[0].stdout_bytes == len("[2, 4, 6] 6\n")
+    assert reports[1].output_bytes == 0
@@ -0,0 +1,22 @@
+import polars as pl
+import pytest
+
+from intro_datascience import datasets, schemas
+
+
+def test_enum_columns_load_whatever_their_case_and_spacing(raw_dir, sales_rows):
+    messy = sales_rows.with_columns(
+        pl.col("region").str.to_lowercase(),
+        (pl.col("payment_method").str.to_uppercase() + "  "),
+    )
+    messy.write_json(raw_dir / "sales.json")
+    loaded = datasets.sales(raw_dir).collect()
+    assert loaded.schema["region"] == schemas.REGIONS
+    assert loaded["region"].cast(pl.String).equals(sales_rows["region"])
+    assert loaded["payment_method"].cast(pl.String).equals(sales_rows["payment_method"])
+
+
+def test_unknown_enum_value_still_raises():
+    frame = pl.LazyFrame({"region": ["North", "Atlantis"]})
+    with pytest.raises(pl.exceptions.InvalidOperationError):
+        schemas.apply(frame, schemas.SALES).collect()
@@ -0,0 +1,16 @@
+from intro_datascience import datasets, synthetic
+
+
+def test_a_smaller_run_replaces_every_part_of_the_last_one(tmp_path):
+    synthetic.generate_sales(tmp_path, 5000, chunk_rows=1000)
+    synthetic.generate_sales(tmp_path, 2000, chunk_rows=1000)
+    assert datasets.sales(tmp_path).collect().height == 2000
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["sales"]
+
+
+def test_same_seed_gives_the_same_rows(tmp_path):
+    synthetic.generate_weather(tmp_path / "a", stations=3, days=40, chunk_rows=50)
+    synthetic.generate_weather(tmp_path / "b", stations=3, days=40, chunk_rows=50)
+    first = datasets.weather(tmp_path / "a").collect()
+    assert first.height == 120
+    assert first.equals(datasets.weather(tmp_path / "b").collect())
@@ -0,0 +1,80 @@
+import polars as pl
+
+from intro_datascience import schemas, transactions
+
+
+def typed(batch: pl.DataFrame) -> pl.LazyFrame:
+    """A batch typed as ``rollups.append_sales`` types it, with Categorical columns."""
+    return schemas.apply(batch.lazy(), schemas.SALES)
+
+
+def test_upsert_classifies_new_duplicate_and_changed(raw_dir, sales_rows):
+    store = transactions.sales_store(raw_dir)
+    first = store.upsert(typed(sales_rows.head(300)))
+    assert (first.new.height, first.changed.height, first.duplicates) == (300, 0, 0)
+
+    changed = sales_rows.slice(250).with_columns(
+        pl.when(pl.col("transaction_id") == "TXN0260")
+        .then(pl.col("total_amount") + 1)
+        .otherwise(pl.col("total_amount"))
+        .alias("total_amount")
+    )
+    second = store.upsert(typed(changed))
+    assert (second.new.height, second.changed.height, second.duplicates) == (200, 1, 49)
+    assert second.replaced["transaction_id"].to_list() == ["TXN0260"]
+
+    stored = store.scan().collect()
+    assert stored.height == sales_rows.height
+    assert stored["transaction_id"].is_unique().all()
+    updated = stored.filter(pl.col("transaction_id") == "TXN0260")["total_amount"].item()
+    original = sales_rows.filter(pl.col("transaction_id") == "TXN0260")["total_amount"].item()
+    assert updated == original + 1
+
+
+def test_overlapping_batch_is_duplicate_after_new_categories(raw_dir, sales_rows):
+    store = transactions.sales_store(raw_dir)
+    store.upsert(typed(sales_rows.head(300)))
+    # Creating other categories shifts Categorical codes in this process
+    pl.Series(["Zebra", "Aardvark"], dtype=pl.Categorical)
+
+    result = store.upsert(typed(sales_rows.slice(250)))
+    assert result.changed.height == 0
+    assert result.duplicates == 50
+    assert result.new.height == 200
+
+
+def test_repeated_id_within_a_batch_counts_once(raw_dir, sales_rows):
+    store = transactions.sales_store(raw_dir)
+    batch = pl.concat([sales_rows.head(10), sales_rows.head(3)])
+    result = store.upsert(typed(batch))
+    assert (result.new.height, result.duplicates) == (10, 3)
+
+
+def test_index_segments_merge_and_keep_the_latest_version(raw_dir, sales_rows):
+    store = transactions.sales_store(raw_dir)
+    for start in range(0, 500, 50):
+        store.upsert(typed(sales_rows.slice(start, 50)))
+    # Correct the same transaction in several later batches
+    for amount in (1.0, 2.0, 3.0):
+        store.upsert(typed(sales_rows.head(1).with_columns(total_amount=pl.lit(amount))))
+
+    segments = store._manifest()["segments"]
+    assert len(segments) <= 4
+    assert sum(segment["rows"] for segment in segments) >= sales_rows.height
+    stored = store.scan().collect()
+    assert stored.height == sales_rows.height
+    first = sales_rows["transaction_id"][0]
+    assert stored.filter(pl.col("transaction_id") == first)["total_amount"].item() == 3.0
+    statuses = store.classify(typed(sales_rows))["status"].value_counts()
+    assert dict(statuses.iter_rows()) == {"duplicate": sales_rows.height - 1, "changed": 1}
+
+
+def test_index_is_rebuilt_for_another_polars_version(raw_dir, sales_rows):
+    store = transactions.sales_store(raw_dir)
+    store.upsert(typed(sales_rows.head(300)))
+    store.upsert(typed(sales_rows.head(1).with_columns(total_amount=pl.lit(1.0))))
+    store._write_manifest({**store._manifest(), "polars": "0.0.0"})
+
+    statuses = store.classify(typed(sales_rows.head(300)))["status"].value_counts()
+    assert dict(statuses.iter_rows()) == {"duplicate": 299, "changed": 1}
+    assert store._manifest()["polars"] == pl.__version__
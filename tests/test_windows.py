@@ -0,0 +1,45 @@
+from datetime import date
+
+import numpy as np
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from intro_datascience import windows
+
+
+def test_rolling_matches_per_station_rolling_by_date():
+    rng = np.random.default_rng(0)
+    days = pl.date_range(date(2024, 1, 1), date(2024, 3, 31), eager=True)
+    weather = pl.concat(
+        pl.DataFrame({
+            "station_id": station,
+            "date": days,
+            "temperature_high": rng.normal(15, 5, days.len()),
+            "temperature_low": rng.normal(5, 5, days.len()),
+            "precipitation": rng.exponential(2, days.len()),
+        }).sample(fraction=0.8, seed=station)  # leave some days missing
+        for station in range(3)
+    ).sample(fraction=1.0, shuffle=True, seed=1)
+
+    rolled = windows.rolling(weather).collect()
+    expected = weather.sort("station_id", "date").with_columns(
+        pl.col(column).rolling_mean_by("date", window).over("station_id").alias(
+            f"{column}_mean_{window}"
+        )
+        for window in windows.WINDOWS
+        for column in ("temperature_high", "temperature_low")
+    ).with_columns(
+        pl.col("precipitation").rolling_sum_by("date", window).over("station_id").alias(
+            f"precipitation_sum_{window}"
+        )
+        for window in windows.WINDOWS
+    ).with_columns(windows.degree_days())
+    assert_frame_equal(rolled, expected.select(rolled.columns))
+
+
+def test_year_over_year_matches_29_february_to_28_february():
+    dates = [date(2023, 2, 28), date(2024, 2, 28), date(2024, 2, 29), date(2025, 2, 28)]
+    frame = pl.DataFrame({"date": dates, "rain": [1.0, 2.0, 4.0, 8.0]})
+    changes = windows.year_over_year(frame, ["rain"]).collect()["rain_yoy"]
+    # Both February days of 2024 compare to 28 February 2023, and 2025 to 28 February 2024
+    assert changes.to_list() == [None, 1.0, 3.0, 6.0]